@@ -0,0 +1,150 @@
+"""
+Background worker for the AI chatbot.
+Model requests run on a worker thread and stream text into a queue that the
+Tk side drains with root.after, so the window never blocks on a reply.
+"""
+import json
+import queue
+import threading
+
+MODEL = "claude-sonnet-4-20250514"
+MAX_TOKENS = 1000
+MAX_TOOL_ROUNDS = 5  # Tool calls per reply before the model must answer with what it has
+USAGE_FIELDS = ("input_tokens", "output_tokens",
+                "cache_creation_input_tokens", "cache_read_input_tokens")
+ADD_EVENT_REQUIRED = ("date", "event")
+
+
+def parse_add_event(text):
+    """Return the add_event dict embedded in a reply, or None"""
+    if "{" not in text or "}" not in text:
+        return None
+    try:
+        event_data = json.loads(text[text.find("{"):text.rfind("}") + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(event_data, dict) or event_data.get("action") != "add_event":
+        return None
+    if not all(isinstance(event_data.get(key), str) and event_data[key].strip()
+               for key in ADD_EVENT_REQUIRED):
+        return None  # Not something we can add; show the reply as plain text
+    return event_data
+
+
+class ChatWorker:
+    """Runs one streamed model request at a time off the UI thread.
+
+    Messages put on self.messages are (kind, request_id, payload) where kind is
+    "delta" (new text), "tool" ((name, input, reply_queue) - run the tool and
+    put its result string on reply_queue), "usage" (token counts from the
+    API), "done" (full reply), "cancelled" (partial reply) or "error" (the
+    exception).
+    """
+
+    def __init__(self, get_client, tools=None, model=MODEL, max_tokens=MAX_TOKENS,
+                 max_tool_rounds=MAX_TOOL_ROUNDS):
+        self.get_client = get_client
+        self.tools = tools
+        self.model = model
+        self.max_tokens = max_tokens
+        self.max_tool_rounds = max_tool_rounds
+        self.messages = queue.Queue()
+        self._request_id = 0
+        self._cancel = None
+        self._thread = None
+
+    def start(self, system, conversation):
+        """Begin streaming a reply; returns the request id used in queued messages"""
+        self.cancel()
+        self._request_id += 1
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(self._request_id, system, list(conversation), self._cancel),
+            daemon=True
+        )
+        self._thread.start()
+        return self._request_id
+
+    def cancel(self):
+        if self._cancel is not None:
+            self._cancel.set()
+
+    def drain(self):
+        """All queued messages for the current request"""
+        drained = []
+        while True:
+            try:
+                kind, request_id, payload = self.messages.get_nowait()
+            except queue.Empty:
+                return drained
+            if request_id == self._request_id:
+                drained.append((kind, payload))
+
+    def _run(self, request_id, system, conversation, cancel):
+        parts = []
+        usage_totals = {}
+        tool_rounds = 0
+        try:
+            client = self.get_client()
+            while not cancel.is_set():
+                if parts:
+                    # Continuing after a tool call; keep the text blocks apart
+                    parts.append("\n\n")
+                    self.messages.put(("delta", request_id, "\n\n"))
+                request = dict(model=self.model, max_tokens=self.max_tokens,
+                               system=system, messages=conversation)
+                if self.tools:
+                    request["tools"] = self.tools
+                    if tool_rounds >= self.max_tool_rounds:
+                        # Every request is billed; make this one a plain answer
+                        request["tool_choice"] = {"type": "none"}
+                with client.messages.stream(**request) as stream:
+                    for text in stream.text_stream:
+                        if cancel.is_set():
+                            break
+                        parts.append(text)
+                        self.messages.put(("delta", request_id, text))
+                    if cancel.is_set():
+                        break
+                    final = stream.get_final_message()
+
+                for key in USAGE_FIELDS:
+                    usage_totals[key] = usage_totals.get(key, 0) + (getattr(final.usage, key, None) or 0)
+                if final.stop_reason != "tool_use" or tool_rounds >= self.max_tool_rounds:
+                    break
+                tool_rounds += 1
+
+                # Let the model look things up, then continue the same reply
+                results = []
+                for block in final.content:
+                    if block.type == "tool_use":
+                        results.append({
+                            "type": "tool_result",
+                            "tool_use_id": block.id,
+                            "content": self._call_tool(request_id, block.name, block.input, cancel)
+                        })
+                conversation = conversation + [
+                    {"role": "assistant", "content": final.content},
+                    {"role": "user", "content": results}
+                ]
+        except Exception as e:
+            if not cancel.is_set():
+                self.messages.put(("error", request_id, e))
+                return
+
+        if usage_totals:
+            self.messages.put(("usage", request_id, usage_totals))
+        kind = "cancelled" if cancel.is_set() else "done"
+        self.messages.put((kind, request_id, "".join(parts)))
+
+    def _call_tool(self, request_id, name, args, cancel):
+        """Run a tool on the UI thread (which owns the calendar) and wait for its answer"""
+        reply = queue.Queue()
+        self.messages.put(("tool", request_id, (name, args, reply)))
+        while not cancel.is_set():
+            try:
+                return reply.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return ""
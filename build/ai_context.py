@@ -0,0 +1,303 @@
+"""
+Builds the calendar context sent to the AI chatbot.
+Instead of the whole calendar, each turn gets the days the user mentioned and
+the weeks around today in full, plus one-line summaries of other months, all
+under a token budget. The fixed instructions come first and are marked for
+prompt caching; the calendar part follows. Rendered days and month summaries
+are cached and only rebuilt when the store reports a change to them.
+"""
+import re
+from collections import Counter
+from datetime import date, timedelta
+
+from event_store import changed_days, format_date
+
+STABLE_INSTRUCTIONS = """You are a helpful calendar assistant. You have access to the user's calendar.
+
+Your tasks:
+1. Help users add new events to their calendar
+2. Answer questions about what events are scheduled
+3. Tell users if a day is free or busy
+4. Help find available time slots
+
+When the user wants to add an event, extract the details and respond with JSON in this EXACT format:
+{
+    "action": "add_event",
+    "date": "M/D/YY",
+    "event": "event description",
+    "start_time": "start time (or empty string)",
+    "end_time": "end time (or empty string)",
+    "category": "Spiritual|Physical|Emotional|Intellectual",
+    "repeat": "never|daily|weekly|monthly",
+    "repeat_until": "M/D/YY (or empty string)"
+}
+
+Date format must be M/D/YY (e.g., "1/15/26" for January 15, 2026).
+Only set "repeat" when the user asks for a repeating event.
+
+The calendar below lists some days in full and summarizes other months. For anything else, use the
+calendar tools instead of guessing:
+- get_events to look up the events on dates that are not listed in full
+- find_free_slots to say whether a day is free or to suggest open times
+- check_conflicts before proposing a time for a new event
+- busy_summary for how time is split across categories
+
+For all other questions about the calendar, respond naturally with helpful information.
+If information is missing when adding an event, ask for it in a friendly way."""
+
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+NUMERIC_DATE = re.compile(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{2}|\d{4}))?\b")
+NAMED_DATE = re.compile(
+    r"\b(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})(?:st|nd|rd|th)?\b(?:,?\s+(\d{4}))?"
+)
+WEEKDAY = re.compile(r"\b(mon|tue|wed|thu|fri|sat|sun)[a-z]*day\b")
+
+CHARS_PER_TOKEN = 4  # Rough estimate, good enough for budgeting
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _guess_year(month, day, today):
+    """Pick the year that puts month/day nearest to today (on a tie, the future one)"""
+    candidates = []
+    for year in (today.year - 1, today.year, today.year + 1):
+        try:
+            candidates.append(date(year, month, day))
+        except ValueError:
+            pass  # e.g. 2/29 outside a leap year
+    if not candidates:
+        return None
+    return min(candidates, key=lambda d: (abs((d - today).days), d < today))
+
+
+def mentioned_dates(message, today):
+    """Dates referred to in a chat message, as ordinals"""
+    text = message.lower()
+    found = []
+
+    for month, day, year in NUMERIC_DATE.findall(text):
+        if year:
+            year = int(year)
+            year += 2000 if year < 100 else 0
+            try:
+                found.append(date(year, int(month), int(day)))
+            except ValueError:
+                pass
+        else:
+            guess = _guess_year(int(month), int(day), today)
+            if guess:
+                found.append(guess)
+
+    for month_name, day, year in NAMED_DATE.findall(text):
+        month = MONTHS.index(month_name[:3]) + 1
+        if year:
+            try:
+                found.append(date(int(year), month, int(day)))
+            except ValueError:
+                pass
+        else:
+            guess = _guess_year(month, int(day), today)
+            if guess:
+                found.append(guess)
+
+    for weekday_name in WEEKDAY.findall(text):
+        ahead = (WEEKDAYS.index(weekday_name) - today.weekday()) % 7
+        found.append(today + timedelta(days=ahead))
+
+    if "today" in text or "tonight" in text:
+        found.append(today)
+    if "tomorrow" in text:
+        found.append(today + timedelta(days=1))
+    if "yesterday" in text:
+        found.append(today - timedelta(days=1))
+    if "next week" in text:
+        found.extend(today + timedelta(days=7 + i) for i in range(7))
+
+    return [d.toordinal() for d in found]
+
+
+class ContextBuilder:
+    def __init__(self, store, token_budget=3000, weeks_before=1, weeks_after=3):
+        self.store = store
+        self.token_budget = token_budget
+        self.weeks_before = weeks_before
+        self.weeks_after = weeks_after
+        self._day_text = {}      # ordinal -> rendered day block
+        self._month_text = {}    # (year, month) -> summary line
+        self._last = None        # (key, system blocks, stats) from the previous build
+        self.last_stats = {}
+        store.subscribe(self._on_change)
+
+    def _on_change(self, op, event, old_ordinal, was_series):
+        days = changed_days(event, old_ordinal, was_series)
+        if days is None:
+            self._day_text.clear()
+            self._month_text.clear()
+            return
+        for ordinal in days:
+            self._day_text.pop(ordinal, None)
+            d = date.fromordinal(ordinal)
+            self._month_text.pop((d.year, d.month), None)
+
+    def build(self, user_message, today=None):
+        """Return the system prompt blocks for one chat turn"""
+        today = today or date.today()
+        focus = mentioned_dates(user_message, today)
+        key = (self.store.version, today, tuple(focus))
+        if self._last and self._last[0] == key:
+            self.last_stats = dict(self._last[2], reused=True)
+            return self._last[1]
+
+        calendar_text, stats = self._calendar_text(today, focus)
+        system = [
+            {"type": "text", "text": STABLE_INSTRUCTIONS, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": calendar_text}
+        ]
+        stats["stable_tokens"] = estimate_tokens(STABLE_INSTRUCTIONS)
+        stats["prompt_tokens"] = stats["stable_tokens"] + stats["calendar_tokens"]
+        stats["reused"] = False
+        self._last = (key, system, stats)
+        self.last_stats = stats
+        return system
+
+    def _candidate_days(self, today, focus):
+        """Days worth showing in full, most relevant first"""
+        t = today.toordinal()
+        seen = set()
+        ordered = []
+
+        def take(ordinal):
+            if ordinal not in seen:
+                seen.add(ordinal)
+                ordered.append(ordinal)
+
+        for ordinal in focus:
+            take(ordinal)
+        for ordinal in focus:
+            take(ordinal - 1)
+            take(ordinal + 1)
+        take(t)
+        for offset in range(1, 7 * max(self.weeks_before, self.weeks_after) + 1):
+            if offset <= 7 * self.weeks_after:
+                take(t + offset)
+            if offset <= 7 * self.weeks_before:
+                take(t - offset)
+        return ordered
+
+    def _calendar_text(self, today, focus):
+        header = f"Today is {today.strftime('%A, %B %d, %Y')} ({format_date(today.toordinal())}).\n\n"
+        used = estimate_tokens(header)
+        # Keep a share of the budget for the month summaries
+        detail_budget = int(self.token_budget * 0.75)
+
+        detailed = []
+        for ordinal in self._candidate_days(today, focus):
+            block = self._render_day(ordinal)
+            cost = estimate_tokens(block)
+            if used + cost > detail_budget:
+                if ordinal in focus:
+                    continue  # A later (shorter) mentioned day may still fit
+                break
+            detailed.append((ordinal, block))
+            used += cost
+        detailed.sort()
+
+        repeating = []
+        for series in self.store.series():
+            line = self._describe_series(series)
+            cost = estimate_tokens(line)
+            if used + cost > self.token_budget:
+                break
+            repeating.append(line)
+            used += cost
+
+        summaries = []
+        for year, month in self._months_by_distance(today):
+            line = self._summarize_month(year, month)
+            cost = estimate_tokens(line)
+            if used + cost > self.token_budget:
+                break
+            summaries.append(((year, month), line))
+            used += cost
+        summaries.sort()
+
+        text = header + "Calendar events (full detail, in date order):\n\n"
+        text += "".join(block for _, block in detailed) or "(no events in this window)\n\n"
+        if repeating:
+            text += "Repeating events (already included in the days above):\n"
+            text += "".join(repeating) + "\n"
+        if summaries:
+            text += "Month summaries (event counts by category):\n"
+            text += "".join(line for _, line in summaries)
+
+        stats = {
+            "calendar_tokens": estimate_tokens(text),
+            "days_detailed": len(detailed),
+            "series_listed": len(repeating),
+            "months_summarized": len(summaries),
+            "total_events": len(self.store)
+        }
+        return text, stats
+
+    def _render_day(self, ordinal):
+        block = self._day_text.get(ordinal)
+        if block is not None:
+            return block
+
+        events = self.store.events_on(ordinal)
+        d = date.fromordinal(ordinal)
+        if not events:
+            block = f"Date: {format_date(ordinal)} ({d.strftime('%A')}) - no events\n"
+        else:
+            block = f"Date: {format_date(ordinal)} ({d.strftime('%A')})\n"
+            for event in events:
+                event_name = event.name
+                start_time = event.start_time or ""
+                end_time = event.end_time or ""
+                category = event.category or "Intellectual"
+
+                if start_time and end_time:
+                    block += f"  - {start_time} - {end_time}: {event_name} [{category}]\n"
+                elif start_time:
+                    block += f"  - {start_time}: {event_name} [{category}]\n"
+                else:
+                    block += f"  - {event_name} [{category}]\n"
+        block += "\n"
+        self._day_text[ordinal] = block
+        return block
+
+    @staticmethod
+    def _describe_series(series):
+        rule = series.rule
+        line = f"  - {series.name}: {rule.describe()}"
+        if series.start_time and series.end_time:
+            line += f", {series.start_time} - {series.end_time}"
+        elif series.start_time:
+            line += f", {series.start_time}"
+        line += f", from {series.date}"
+        if rule.last is not None:
+            line += f" to {format_date(rule.last)}"
+        if rule.exdates:
+            line += f" (skipped on {len(rule.exdates)} days)"
+        return line + f" [{series.category or 'Intellectual'}]\n"
+
+    def _months_by_distance(self, today):
+        here = today.year * 12 + today.month - 1
+        months = self.store.months()
+        return sorted(months, key=lambda ym: abs(ym[0] * 12 + ym[1] - 1 - here))
+
+    def _summarize_month(self, year, month):
+        line = self._month_text.get((year, month))
+        if line is not None:
+            return line
+
+        events = self.store.events_in_month(year, month)
+        counts = Counter(event.category or "Intellectual" for event in events)
+        by_category = ", ".join(f"{category} {count}" for category, count in counts.most_common())
+        line = f"  {date(year, month, 1).strftime('%B %Y')}: {len(events)} events ({by_category})\n"
+        self._month_text[(year, month)] = line
+        return line
@@ -0,0 +1,149 @@
+"""
+Calendar tools the AI chatbot can call (Anthropic tool use).
+Answers come from the event store and availability engine, so the model asks
+for exactly the days it needs instead of reading the whole calendar.
+"""
+import json
+from datetime import date
+
+from availability import NO_TIME, event_interval, format_minutes
+from event_store import format_date, parse_date, parse_time_for_sorting
+
+MAX_RANGE_DAYS = 92  # Keep tool answers small
+
+DATE_PARAM = {"type": "string", "description": "Date in M/D/YY format, e.g. 1/15/26"}
+
+TOOLS = [
+    {
+        "name": "get_events",
+        "description": "List the events scheduled between two dates (inclusive), in date and time order.",
+        "input_schema": {
+            "type": "object",
+            "properties": {"start_date": DATE_PARAM, "end_date": DATE_PARAM},
+            "required": ["start_date", "end_date"]
+        }
+    },
+    {
+        "name": "find_free_slots",
+        "description": "Find open time slots of at least the given length between two dates (inclusive). "
+                       "Use this to answer whether a day is free or to suggest times for a new event.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "start_date": DATE_PARAM,
+                "end_date": DATE_PARAM,
+                "duration_minutes": {"type": "integer", "description": "Minimum slot length, default 30"},
+                "earliest": {"type": "string", "description": "Earliest start each day, e.g. 8:00 AM (default)"},
+                "latest": {"type": "string", "description": "Latest end each day, e.g. 9:00 PM (default)"}
+            },
+            "required": ["start_date", "end_date"]
+        }
+    },
+    {
+        "name": "check_conflicts",
+        "description": "Check whether a proposed time on a date overlaps existing events.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "date": DATE_PARAM,
+                "start_time": {"type": "string", "description": "e.g. 2:30 PM"},
+                "end_time": {"type": "string", "description": "e.g. 3:30 PM (optional)"}
+            },
+            "required": ["date", "start_time"]
+        }
+    },
+    {
+        "name": "busy_summary",
+        "description": "Total scheduled minutes and event counts per category (Spiritual, Physical, "
+                       "Emotional, Intellectual) between two dates (inclusive).",
+        "input_schema": {
+            "type": "object",
+            "properties": {"start_date": DATE_PARAM, "end_date": DATE_PARAM},
+            "required": ["start_date", "end_date"]
+        }
+    }
+]
+
+
+class ToolError(Exception):
+    """Bad tool input; the message is returned to the model"""
+
+
+def _date_range(args):
+    start = parse_date(str(args.get("start_date", "")))
+    end = parse_date(str(args.get("end_date", args.get("start_date", ""))))
+    if start is None or end is None:
+        raise ToolError("Dates must be in M/D/YY format.")
+    if end < start:
+        start, end = end, start
+    if end - start >= MAX_RANGE_DAYS:
+        raise ToolError(f"Please ask for at most {MAX_RANGE_DAYS} days at a time.")
+    return start, end
+
+
+def _describe(event):
+    item = {"date": event.date, "event": event.name, "category": event.category or "Intellectual"}
+    if event.start_time:
+        item["start_time"] = event.start_time
+    if event.end_time:
+        item["end_time"] = event.end_time
+    return item
+
+
+class CalendarTools:
+    def __init__(self, store, availability):
+        self.store = store
+        self.availability = availability
+
+    def run(self, name, args):
+        """Execute a tool call and return its result as a JSON string"""
+        handler = getattr(self, f"_tool_{name}", None)
+        if handler is None:
+            return json.dumps({"error": f"Unknown tool: {name}"})
+        try:
+            return json.dumps(handler(args or {}))
+        except (ToolError, ValueError) as e:
+            return json.dumps({"error": str(e)})
+        except Exception as e:
+            # Anything else still goes back to the model; it must never reach the Tk callback
+            return json.dumps({"error": f"{name} failed: {e}"})
+
+    def _tool_get_events(self, args):
+        start, end = _date_range(args)
+        events = sorted(
+            self.store.events_between(start, end),
+            key=lambda e: (e.ordinal, parse_time_for_sorting(e.start_time))
+        )
+        return {"events": [_describe(e) for e in events]}
+
+    def _tool_find_free_slots(self, args):
+        start, end = _date_range(args)
+        day_start = parse_time_for_sorting(str(args.get("earliest") or "8:00 AM"))
+        day_end = parse_time_for_sorting(str(args.get("latest") or "9:00 PM"))
+        if day_start >= NO_TIME or day_end >= NO_TIME:
+            raise ToolError("earliest/latest must be times like 8:00 AM.")
+        duration = int(args.get("duration_minutes") or 30)
+        slots = self.availability.free_slots(start, end, duration, day_start, day_end, limit=50)
+        return {"free_slots": [
+            {
+                "date": format_date(ordinal),
+                "weekday": date.fromordinal(ordinal).strftime("%A"),
+                "start_time": format_minutes(s),
+                "end_time": format_minutes(e)
+            }
+            for ordinal, s, e in slots
+        ]}
+
+    def _tool_check_conflicts(self, args):
+        ordinal = parse_date(str(args.get("date", "")))
+        if ordinal is None:
+            raise ToolError("Dates must be in M/D/YY format.")
+        span = event_interval(str(args.get("start_time") or ""), str(args.get("end_time") or ""))
+        if span is None:
+            raise ToolError("start_time must be a time like 2:30 PM.")
+        conflicts = self.availability.conflicts(ordinal, span[0], span[1])
+        return {"conflict": bool(conflicts), "overlapping_events": [_describe(e) for e in conflicts]}
+
+    def _tool_busy_summary(self, args):
+        start, end = _date_range(args)
+        return {"by_category": self.availability.busy_totals(start, end)}
@@ -0,0 +1,115 @@
+"""
+Free/busy engine for the Life Wellness Calendar.
+Each day's timed events are kept as a list of (start, end) minute intervals
+sorted by start, built from parse_time_for_sorting on first use and dropped
+when the store reports a change to that day. Events with no start time count
+as all-day notes and don't block time.
+"""
+from bisect import bisect_left
+from collections import defaultdict
+
+from event_store import changed_days, parse_time_for_sorting, to_ordinal
+
+NO_TIME = 9999
+DEFAULT_DURATION = 30      # Minutes assumed when an event has a start but no end
+DAY_END = 24 * 60
+
+
+def event_interval(start_time, end_time):
+    """(start, end) minutes for an event's times, or None if it has no usable start"""
+    start = parse_time_for_sorting(start_time)
+    if start >= NO_TIME:
+        return None
+    end = parse_time_for_sorting(end_time)
+    if end >= NO_TIME:
+        end = start + DEFAULT_DURATION
+    elif end <= start:
+        end = DAY_END  # Runs past midnight; only count the part on this day
+    return start, min(end, DAY_END)
+
+
+def format_minutes(minutes):
+    """Minutes from midnight as 12-hour clock text, e.g. 2:30 PM"""
+    hours, mins = divmod(minutes % DAY_END, 60)
+    suffix = "AM" if hours < 12 else "PM"
+    return f"{hours % 12 or 12}:{mins:02d} {suffix}"
+
+
+class AvailabilityEngine:
+    def __init__(self, store):
+        self.store = store
+        self._days = {}        # ordinal -> ([starts], [(start, end, event)]) sorted by start
+        store.subscribe(self._on_change)
+
+    def _on_change(self, op, event, old_ordinal, was_series):
+        days = changed_days(event, old_ordinal, was_series)
+        if days is None:
+            self._days.clear()
+            return
+        for ordinal in days:
+            self._days.pop(ordinal, None)
+
+    def _day(self, ordinal):
+        day = self._days.get(ordinal)
+        if day is None:
+            intervals = []
+            for event in self.store.events_on(ordinal):
+                span = event_interval(event.start_time, event.end_time)
+                if span:
+                    intervals.append((span[0], span[1], event))
+            intervals.sort(key=lambda item: (item[0], item[1]))
+            day = ([item[0] for item in intervals], intervals)
+            self._days[ordinal] = day
+        return day
+
+    def intervals_on(self, day):
+        """[(start, end, event), ...] for a day's timed events, sorted by start"""
+        return self._day(to_ordinal(day))[1]
+
+    def conflicts(self, day, start, end, exclude_id=None):
+        """Events on day overlapping [start, end) minutes"""
+        starts, intervals = self._day(to_ordinal(day))
+        # Only intervals starting before `end` can overlap
+        hits = []
+        for s, e, event in intervals[:bisect_left(starts, end)]:
+            if e > start and event.id != exclude_id:
+                hits.append(event)
+        return hits
+
+    def busy_blocks(self, day):
+        """Merged busy (start, end) blocks for a day"""
+        merged = []
+        for s, e, _ in self.intervals_on(day):
+            if merged and s <= merged[-1][1]:
+                if e > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], e)
+            else:
+                merged.append((s, e))
+        return merged
+
+    def free_slots(self, start_day, end_day, duration=DEFAULT_DURATION,
+                   day_start=8 * 60, day_end=21 * 60, limit=None):
+        """[(ordinal, start, end), ...] gaps of at least duration minutes within working hours"""
+        slots = []
+        for ordinal in range(to_ordinal(start_day), to_ordinal(end_day) + 1):
+            cursor = day_start
+            for s, e in self.busy_blocks(ordinal) + [(day_end, day_end)]:
+                s, e = min(max(s, day_start), day_end), min(e, day_end)
+                if s - cursor >= duration:
+                    slots.append((ordinal, cursor, s))
+                    if limit and len(slots) >= limit:
+                        return slots
+                cursor = max(cursor, e)
+        return slots
+
+    def busy_totals(self, start_day, end_day):
+        """{category: {"minutes": ..., "events": ...}} over a date range"""
+        totals = defaultdict(lambda: {"minutes": 0, "events": 0})
+        for ordinal in self.store.days_between(start_day, end_day):
+            for event in self.store.events_on(ordinal):
+                total = totals[event.category or "Intellectual"]
+                total["events"] += 1
+                span = event_interval(event.start_time, event.end_time)
+                if span:
+                    total["minutes"] += span[1] - span[0]
+        return dict(totals)
@@ -0,0 +1,356 @@
+"""
+Synthetic-load benchmarks for the Life Wellness Calendar core.
+
+Generates calendars shaped like ours (a daily Rosary, weekday chores and
+work, walks and practice a few times a week, plus one-off notes and due
+dates) at several sizes, then times loading, saving, journaling, per-day
+queries, listbox model builds, AI context builds and weather parsing.
+Results are printed as JSON (or written with --output) so runs can be
+compared between releases with --compare. Runs headless: no display,
+network or API keys needed.
+
+--startup also launches the Tk app (this folder's, or an older checkout's
+with --app-dir) and measures time to first paint and until the events are
+on screen. That part needs a display; on Linux it starts Xvfb if there is
+no $DISPLAY, and is skipped if neither is available.
+
+Usage: python benchmark.py [--sizes 1000,10000,100000] [--output results.json]
+                           [--compare baseline.json] [--series]
+                           [--startup] [--startup-events 10000] [--app-dir DIR]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+from ai_context import ContextBuilder
+from event_store import format_date
+from render import RowCache
+from storage import JournalStorage
+from weather import parse_current, parse_forecast
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+EVENTS_PER_DAY = 3.5          # Roughly what calendar_data.json has
+FIRST_DAY = date(1970, 1, 1)  # M/D/YY dates only cover 1969-2068
+LAST_DAY = date(2068, 12, 31)
+QUERY_DAYS = 1000
+JOURNAL_WRITES = 100
+STARTUP_RUNS = 5
+STARTUP_TIMEOUT = 60
+
+# Run in a fresh interpreter: times (from the parent's spawn) until the first
+# paint and until the app has its events on screen, then closes the window
+STARTUP_HARNESS = """
+import json, sys, time
+spawned, app_dir = float(sys.argv[1]), sys.argv[2]
+sys.path.insert(0, app_dir)
+import tkinter as tk
+import schedule_app
+
+root = tk.Tk()
+app = schedule_app.ScheduleApp(root)
+result = {}
+
+def ready():
+    # Older versions load the calendar before the window exists and have no .core
+    if getattr(app, "core", "loaded") is None:
+        root.after(5, ready)
+        return
+    result["ready"] = time.perf_counter() - spawned
+    print(json.dumps(result))
+    root.destroy()
+
+def painted():
+    root.update_idletasks()
+    result["first_paint"] = time.perf_counter() - spawned
+    ready()
+
+root.after_idle(painted)
+root.mainloop()
+"""
+
+# (name, start, end, category, weekdays it happens on)
+TEMPLATES = [
+    ("Praying the Rosary", "11:00 AM", "11:20 AM", "Spiritual", range(7)),
+    ("Work", "6:00 AM", "3:00 PM", "Intellectual", range(5)),
+    ("Daily Chores", "7:00 PM", "8:00 PM", "Emotional", range(5)),
+    ("Evening Walk", "6:00 PM", "6:30 PM", "Physical", (1, 3, 5)),
+    ("Guitar Practice", "6:30 PM", "7:15 PM", "Emotional", (2,)),
+    ("Leisure Reading", "9:00 PM", "9:45 PM", "Intellectual", (6,)),
+]
+ONE_OFFS = [
+    ("Prayer Time - Psalm 34:18: The Lord is close to the brokenhearted", "", "", "Spiritual"),
+    ("Problem Set Due", "", "", "Intellectual"),
+    ("Library Study Session", "3:30 PM", "4:40 PM", "Intellectual"),
+    ("Virtual Office Hour", "9:00 PM", "9:45 PM", "Intellectual"),
+    ("Counseling Session", "3:00 PM", "4:00 PM", "Emotional"),
+    ("Robotics", "5:00 PM", "8:00 PM", "Intellectual"),
+    ("Team Sports", "4:00 PM", "6:00 PM", "Physical"),
+    ("Community Meditation", "10:00 AM", "11:00 AM", "Spiritual"),
+]
+
+
+def generate(count, seed=0):
+    """count event records (with ids) spread over as many days as the date format allows"""
+    rng = random.Random(seed)
+    first = FIRST_DAY.toordinal() if count > 50000 else date(2026, 1, 1).toordinal()
+    days = max(1, min(LAST_DAY.toordinal() - first + 1, round(count / EVENTS_PER_DAY)))
+
+    records = []
+    for i in range(days):
+        ordinal = first + i
+        wanted = count * (i + 1) // days - count * i // days
+        weekday = date.fromordinal(ordinal).weekday()
+        picks = [t[:4] for t in TEMPLATES if weekday in t[4]]
+        while len(picks) < wanted:
+            picks.append(rng.choice(ONE_OFFS))
+        for name, start, end, category in picks[:wanted]:
+            records.append({
+                "id": len(records) + 1,
+                "date": format_date(ordinal),
+                "event": name,
+                "start_time": start,
+                "end_time": end,
+                "category": category
+            })
+    return records
+
+
+def forecast_payload(seed=0):
+    """A 5-day / 3-hour OpenWeather /forecast response"""
+    rng = random.Random(seed)
+    entries = []
+    for n in range(40):
+        temp = 40 + rng.random() * 30
+        entries.append({
+            "dt_txt": f"2026-01-{10 + n // 8:02d} {n % 8 * 3:02d}:00:00",
+            "main": {"temp": temp, "feels_like": temp - 3, "humidity": rng.randint(30, 90)},
+            "weather": [{"description": rng.choice(["clear sky", "light rain", "overcast clouds"])}],
+            "wind": {"speed": rng.random() * 15}
+        })
+    return {"list": entries}
+
+
+def timed(func, repeat=1):
+    """Best wall time of func() over repeat runs, and its last return value"""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_size(count, repeat, series, workdir):
+    """Benchmark one calendar size; returns a list of result dicts"""
+    records = generate(count)
+    if series:
+        from migrate_recurring import find_series
+        records = find_series(records)[0]
+    path = os.path.join(workdir, f"calendar_{count}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f, separators=(",", ":"))
+
+    results = []
+
+    def record(name, seconds, ops=1, **extra):
+        results.append({"name": name, "events": count, "ops": ops, "seconds": seconds,
+                        "per_op_us": seconds / ops * 1e6, **extra})
+
+    seconds, store = timed(lambda: JournalStorage(path).load(migrate=False), repeat)
+    record("load", seconds, bytes=os.path.getsize(path), records=len(records))
+
+    storage = JournalStorage(path)
+    seconds, _ = timed(lambda: storage.rewrite(store.to_dicts()), repeat)
+    record("save", seconds)
+
+    days = [d.toordinal() for d in store.dates()]
+    rng = random.Random(1)
+    sample = [rng.choice(days) for _ in range(QUERY_DAYS)]
+
+    seconds, _ = timed(lambda: [store.events_on(d) for d in sample], repeat)
+    record("day_query", seconds, ops=len(sample))
+
+    row_cache = RowCache(store)
+    seconds, _ = timed(lambda: [row_cache.model(store.events_on(d)) for d in sample])
+    record("listbox_model_cold", seconds, ops=len(sample))
+    seconds, _ = timed(lambda: [row_cache.model(store.events_on(d)) for d in sample], repeat)
+    record("listbox_model_warm", seconds, ops=len(sample))
+
+    today = date.fromordinal(days[len(days) // 2])
+    builder = ContextBuilder(store)
+    seconds, _ = timed(lambda: builder.build("What do I have this week?", today))
+    record("ai_context_cold", seconds, prompt_tokens=builder.last_stats["prompt_tokens"])
+    seconds, _ = timed(lambda: builder.build(f"Am I free on {today.month}/{today.day}?", today))
+    record("ai_context_warm", seconds, prompt_tokens=builder.last_stats["prompt_tokens"])
+
+    storage = JournalStorage(path)
+    store = storage.load(migrate=False)
+    storage.attach(store)
+    targets = [e.id for e in store.events_on(days[0])] or [None]
+
+    def journal_writes():
+        for n in range(JOURNAL_WRITES):
+            event_id = targets[n % len(targets)]
+            if event_id is None:
+                store.add(days[0], "Benchmark", "8:00 AM", "8:30 AM")
+            else:
+                store.update(event_id, end_time=f"{n % 12 + 1}:00 PM")
+    seconds, _ = timed(journal_writes)
+    storage.close()
+    record("journal_write", seconds, ops=JOURNAL_WRITES)
+    return results
+
+
+def run_weather(repeat):
+    payload = forecast_payload()
+    current = payload["list"][0]
+    ops = 1000
+    seconds, _ = timed(lambda: [parse_forecast(payload) for _ in range(ops)], repeat)
+    results = [{"name": "weather_parse_forecast", "events": None, "ops": ops, "seconds": seconds,
+                "per_op_us": seconds / ops * 1e6}]
+    seconds, _ = timed(lambda: [parse_current(current) for _ in range(ops)], repeat)
+    results.append({"name": "weather_parse_current", "events": None, "ops": ops, "seconds": seconds,
+                    "per_op_us": seconds / ops * 1e6})
+    return results
+
+
+def _display_env():
+    """Environment with a usable display, and the Xvfb process started for it (if any)"""
+    env = dict(os.environ)
+    if not sys.platform.startswith("linux") or env.get("DISPLAY"):
+        return env, None
+    if not shutil.which("Xvfb"):
+        return None, None
+    display = f":{90 + os.getpid() % 100}"
+    xvfb = subprocess.Popen(["Xvfb", display, "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(1)
+    env["DISPLAY"] = display
+    return env, xvfb
+
+
+def run_startup(count, runs, app_dir, workdir):
+    """Median time to first paint / events on screen over runs cold launches of the Tk app"""
+    env, xvfb = _display_env()
+    if env is None:
+        print("⚠️ Skipping --startup: no display and no Xvfb", file=sys.stderr)
+        return []
+    env["OPENWEATHER_API_KEY"] = ""  # No network; the weather panel shows its "not configured" text
+    env["STARTUP_LOG"] = ""
+
+    appdir = os.path.join(workdir, "startup")
+    os.makedirs(appdir, exist_ok=True)
+    with open(os.path.join(appdir, "calendar_data.json"), "w", encoding="utf-8") as f:
+        json.dump(generate(count), f, separators=(",", ":"))
+
+    timings = {"first_paint": [], "ready": []}
+    try:
+        for _ in range(runs):
+            # Start from the same snapshot each time (the app may rewrite it)
+            for name in os.listdir(appdir):
+                if name != "calendar_data.json":
+                    os.remove(os.path.join(appdir, name))
+            spawned = time.perf_counter()
+            out = subprocess.run(
+                [sys.executable, "-c", STARTUP_HARNESS, repr(spawned), os.path.abspath(app_dir)],
+                cwd=appdir, env=env, capture_output=True, text=True, timeout=STARTUP_TIMEOUT
+            )
+            if out.returncode != 0:
+                print(f"⚠️ Startup run failed:\n{out.stderr}", file=sys.stderr)
+                return []
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            for key in timings:
+                timings[key].append(result[key])
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+    return [{"name": f"startup_{key}", "events": count, "ops": 1, "seconds": statistics.median(values),
+             "per_op_us": statistics.median(values) * 1e6, "runs": values, "app_dir": os.path.abspath(app_dir)}
+            for key, values in timings.items()]
+
+
+def compare(results, baseline_path, threshold):
+    """Print per-benchmark ratios against a saved run; returns the number of regressions"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(r["name"], r["events"]): r for r in json.load(f)["results"]}
+    regressions = 0
+    print(f"\nCompared with {baseline_path}:", file=sys.stderr)
+    for r in results:
+        old = baseline.get((r["name"], r["events"]))
+        if not old or not old["per_op_us"]:
+            continue
+        ratio = r["per_op_us"] / old["per_op_us"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  ⚠️ slower"
+            regressions += 1
+        print(f"   {r['name']:<24} {r['events'] or '':>9} {ratio:6.2f}x{flag}", file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the calendar core on synthetic data.")
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES),
+                        help="comma-separated event counts, e.g. 1000,1000000")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per timing (best is kept)")
+    parser.add_argument("--series", action="store_true",
+                        help="fold repeated events into recurring series first (as migrate_recurring.py does)")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio reported as a regression (default 1.25)")
+    parser.add_argument("--startup", action="store_true",
+                        help="also time cold starts of the Tk app (needs a display or Xvfb)")
+    parser.add_argument("--startup-events", type=int, default=10000,
+                        help="calendar size for --startup (default 10000)")
+    parser.add_argument("--app-dir", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="folder with the schedule_app.py to launch, e.g. an older checkout")
+    args = parser.parse_args(argv)
+
+    sizes = [int(n) for n in args.sizes.split(",") if n.strip()]
+    results = []
+    with tempfile.TemporaryDirectory(prefix="calendar-bench-") as workdir:
+        for count in sizes:
+            print(f"⏱️ {count:,} events...", file=sys.stderr)
+            results.extend(run_size(count, args.repeat, args.series, workdir))
+        if args.startup:
+            print(f"⏱️ Startup with {args.startup_events:,} events...", file=sys.stderr)
+            results.extend(run_startup(args.startup_events, STARTUP_RUNS, args.app_dir, workdir))
+    results.extend(run_weather(args.repeat))
+
+    for r in results:
+        print(f"   {r['name']:<24} {r['events'] or '':>9} {r['per_op_us']:>14,.1f} µs/op", file=sys.stderr)
+
+    report = {
+        "benchmark": "life-wellness-calendar",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "series": args.series,
+        "repeat": args.repeat,
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
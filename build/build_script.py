@@ -1,14 +1,20 @@
 """
 Build script for creating the Life Wellness Calendar desktop application
 Run this script to build the .exe file
+
+    python build_script.py               # one LifeWellnessCalendar.exe file
+    python build_script.py --fast-start  # a folder (onedir, no UPX) that starts faster
 """
+import argparse
 import os
 import sys
 import subprocess
 
-def build_app():
+def build_app(fast_start=False):
     print("=" * 60)
     print("Building Life Wellness Calendar Desktop Application")
+    if fast_start:
+        print("Fast-start build: onedir, no UPX")
     print("=" * 60)
     
     # Change to the build directory
@@ -80,11 +86,18 @@ def build_app():
     
     icon_arg = '--icon=calendar_app.ico' if os.path.exists('calendar_app.ico') else ''
     
+    # A onefile .exe unpacks itself to a temp folder on every launch, and UPX-packed
+    # DLLs are decompressed on load; the fast-start build skips both
+    if fast_start:
+        layout_args = ['--onedir', '--noupx']  # Folder with the .exe and its libraries
+    else:
+        layout_args = ['--onefile']  # Single executable file
+
     cmd = [
         sys.executable,
         '-m', 'PyInstaller',
         '--name=LifeWellnessCalendar',
-        '--onefile',  # Single executable file
+        *layout_args,
         '--windowed',  # No console window
         icon_arg,  # Custom icon (if available)
         '--add-data=.env;.' if sys.platform == 'win32' else '--add-data=.env:.',  # Include .env
@@ -105,15 +118,22 @@ def build_app():
         print("✅ BUILD SUCCESSFUL!")
         print("=" * 60)
         print("\n📁 Your application is ready:")
-        exe_path = os.path.join(build_dir, 'dist', 'LifeWellnessCalendar.exe')
+        if fast_start:
+            exe_path = os.path.join(build_dir, 'dist', 'LifeWellnessCalendar', 'LifeWellnessCalendar.exe')
+        else:
+            exe_path = os.path.join(build_dir, 'dist', 'LifeWellnessCalendar.exe')
         print(f"   Location: {exe_path}")
         print("\n💡 Next steps:")
-        print("   1. Test the application: dist/LifeWellnessCalendar.exe")
+        print(f"   1. Test the application: {os.path.relpath(exe_path, build_dir)}")
         print("   2. Create a shortcut on your desktop")
-        print("   3. Share with others (they don't need Python installed!)")
+        if fast_start:
+            print("   3. Share the whole dist/LifeWellnessCalendar folder (they don't need Python installed!)")
+        else:
+            print("   3. Share with others (they don't need Python installed!)")
         print("\n⚠️  Important:")
         print("   - Make sure to include your .env file with API keys")
         print("   - The app will create calendar_data.json in the same folder")
+        print("   - Set STARTUP_LOG=startup_log.jsonl in .env to record startup timings")
         
     except subprocess.CalledProcessError as e:
         print("\n❌ Build failed!")
@@ -121,4 +141,7 @@ def build_app():
         sys.exit(1)
 
 if __name__ == "__main__":
-    build_app()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Build the Life Wellness Calendar app with PyInstaller.")
+    parser.add_argument("--fast-start", "--onedir", action="store_true", dest="fast_start",
+                        help="build a onedir folder without UPX; starts faster than the single .exe")
+    build_app(fast_start=parser.parse_args().fast_start)
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""
+GUI-free core of the Life Wellness Calendar.
+ScheduleCore wires the event store, journal storage, availability engine,
+AI context builder, chatbot tools and listbox row cache together, so the Tk
+app, the benchmarks and scripts all run the same code. Nothing here needs a
+display, network access or an API key.
+"""
+from event_store import EventStore, parse_date
+from ai_context import ContextBuilder
+from ai_tools import CalendarTools
+from availability import AvailabilityEngine, event_interval
+from recurrence import Recurrence
+from render import RowCache
+from storage import JournalStorage, StorageError
+
+# Starting calendar when nothing has been saved yet
+DEFAULT_EVENTS = [
+    {"date": "1/19/26", "event": "Study Session - Problem Set Prep", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "1/26/26", "event": "Group Study Meeting", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "1/26/26", "event": "Research Project Work", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "2/2/26", "event": "Exam Preparation", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "2/2/26", "event": "Tutorial Session", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "2/2/26", "event": "Online Course Review", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "2/9/26", "event": "Case Study Analysis", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "2/9/26", "event": "Research Documentation", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "2/9/26", "event": "Learning Module", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "2/16/26", "event": "Advanced Study", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "2/16/26", "event": "Project Collaboration", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "2/23/26", "event": "Final Exam Prep", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "2/24/26", "event": "Team Presentation", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "3/2/26", "event": "Assessment Review", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "3/2/26", "event": "Project Evaluation", "start_time": "", "end_time": "", "category": "Intellectual"},
+    {"date": "1/13/26", "event": "Morning Meditation", "start_time": "6:00 AM", "end_time": "6:30 AM", "category": "Spiritual"},
+    {"date": "1/15/26", "event": "Yoga Class", "start_time": "7:00 AM", "end_time": "8:00 AM", "category": "Physical"},
+    {"date": "1/20/26", "event": "Journaling Session", "start_time": "8:00 PM", "end_time": "8:30 PM", "category": "Emotional"},
+    {"date": "1/22/26", "event": "Fitness Training", "start_time": "5:30 PM", "end_time": "6:30 PM", "category": "Physical"},
+    {"date": "1/27/26", "event": "Counseling Session", "start_time": "3:00 PM", "end_time": "4:00 PM", "category": "Emotional"},
+    {"date": "1/29/26", "event": "Prayer Time", "start_time": "7:00 PM", "end_time": "7:30 PM", "category": "Spiritual"},
+    {"date": "2/3/26", "event": "Exercise Class", "start_time": "6:00 PM", "end_time": "7:00 PM", "category": "Physical"},
+    {"date": "2/5/26", "event": "Mindfulness Retreat", "start_time": "9:00 AM", "end_time": "5:00 PM", "category": "Spiritual"},
+    {"date": "2/10/26", "event": "Running Session", "start_time": "6:00 AM", "end_time": "7:00 AM", "category": "Physical"},
+    {"date": "2/12/26", "event": "Wellness Workshop", "start_time": "2:00 PM", "end_time": "4:00 PM", "category": "Emotional"},
+    {"date": "2/17/26", "event": "Team Sports", "start_time": "4:00 PM", "end_time": "6:00 PM", "category": "Physical"},
+    {"date": "2/19/26", "event": "Spiritual Book Club", "start_time": "7:00 PM", "end_time": "8:30 PM", "category": "Spiritual"},
+    {"date": "2/24/26", "event": "Reflection Time", "start_time": "9:00 PM", "end_time": "9:30 PM", "category": "Emotional"},
+    {"date": "2/26/26", "event": "Community Meditation", "start_time": "10:00 AM", "end_time": "11:00 AM", "category": "Spiritual"},
+]
+
+
+def make_rule(repeat, start_date, until_text=""):
+    """Recurrence for a "Never/Daily/Weekly/Monthly" choice starting on start_date (None for Never)"""
+    if not repeat or repeat.lower() in ("never", "none"):
+        return None
+    if repeat.lower() not in ("daily", "weekly", "monthly"):
+        raise ValueError(f"Unknown repeat option: {repeat}")
+    until = None
+    if until_text:
+        until = parse_date(until_text)
+        if until is None:
+            raise ValueError("Repeat until must be a date like 12/31/26.")
+        start = parse_date(start_date)
+        if start is not None and until < start:
+            # The series would have no occurrences, so nothing would ever show it
+            raise ValueError(f"Repeat until can't be before the event's date ({start_date}).")
+    return Recurrence(repeat.lower(), until=until)
+
+
+class ScheduleCore:
+    def __init__(self, data_file="calendar_data.json"):
+        self.storage = JournalStorage(data_file)
+        self.load_error = None  # Set when the saved calendar couldn't be read
+        self.read_only = False  # True when the saved files are still in place but unreadable
+        self.store = self._load()
+        self.skipped_records = len(self.store.unreadable)  # Saved records that couldn't be read
+        if not self.read_only:
+            self.storage.attach(self.store)
+        self.context_builder = ContextBuilder(self.store)
+        self.availability = AvailabilityEngine(self.store)
+        self.calendar_tools = CalendarTools(self.store, self.availability)
+        self.row_cache = RowCache(self.store)
+
+    def _load(self):
+        # Try to load saved data first (snapshot + journal replay)
+        try:
+            store = self.storage.load()
+            if store is not None:
+                return store
+        except StorageError as e:
+            self.load_error = e  # The bad files were moved aside, so it's safe to start over
+        except OSError as e:
+            # Couldn't even open the files; don't journal demo edits on top of them
+            self.load_error = e
+            self.read_only = True
+        return EventStore.from_dicts(DEFAULT_EVENTS)
+
+    def conflicts(self, day, start_time, end_time, exclude_id=None):
+        """Events on day overlapping the given times ([] if there's no usable start time)"""
+        span = event_interval(start_time, end_time)
+        if span is None:
+            return []
+        return self.availability.conflicts(day, span[0], span[1], exclude_id)
+
+    def add_from_ai(self, event_data):
+        """Add an event parsed from the chatbot's JSON reply; returns the new event"""
+        try:
+            rule = make_rule(event_data.get("repeat"), event_data["date"], event_data.get("repeat_until"))
+        except ValueError:
+            rule = None
+        return self.store.add(
+            event_data["date"],
+            event_data["event"],
+            event_data.get("start_time", ""),
+            event_data.get("end_time", ""),
+            event_data.get("category", "Intellectual"),
+            rule=rule
+        )
+
+    def take_save_error(self):
+        return self.storage.take_error()
+
+    def close(self):
+        self.storage.close()
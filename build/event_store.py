@@ -0,0 +1,457 @@
+"""
+Date-indexed event store for the Life Wellness Calendar.
+Events are kept in a per-day index keyed by date ordinal plus a sorted list of
+days that have events, so day/week/month lookups don't scan the whole calendar.
+Repeating events are stored once as a series (an event with a Recurrence rule)
+and expanded into occurrences only for the days being queried.
+"""
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+
+from recurrence import Recurrence
+
+# Fields every event record carries in calendar_data.json
+EVENT_FIELDS = ("id", "date", "event", "start_time", "end_time", "category", "rrule")
+
+# Fields a single occurrence of a series can override: JSON key -> Event attribute
+OVERRIDE_FIELDS = {"event": "name", "start_time": "start_time", "end_time": "end_time", "category": "category"}
+
+# How far an open-ended series is shown in month/day listings
+OPEN_SERIES_HORIZON = 366
+
+
+def parse_date(date_str):
+    """Convert an "M/D/YY" string to a date ordinal (None if it can't be parsed)"""
+    try:
+        month, day, year = date_str.strip().split("/")
+        year = int(year)
+        if year < 100:
+            # Same pivot as strptime's %y: 00-68 -> 2000s, 69-99 -> 1900s
+            year += 2000 if year < 69 else 1900
+        return date(year, int(month), int(day)).toordinal()
+    except (AttributeError, ValueError):
+        return None
+
+
+def format_date(ordinal):
+    """Convert a date ordinal back to the app's "M/D/YY" format"""
+    d = date.fromordinal(ordinal)
+    return f"{d.month}/{d.day}/{d.year % 100:02d}"
+
+
+def parse_time_for_sorting(time_str):
+    """Convert time string to minutes from midnight for sorting"""
+    if not time_str:
+        return 9999  # Put events without time at the end
+    
+    time_str = time_str.strip().upper()
+    
+    try:
+        # Handle 12-hour format (e.g., "2:30 PM", "10:00 AM")
+        if 'AM' in time_str or 'PM' in time_str:
+            time_part = time_str.replace('AM', '').replace('PM', '').strip()
+            is_pm = 'PM' in time_str
+            
+            if ':' in time_part:
+                hours, minutes = map(int, time_part.split(':'))
+            else:
+                hours = int(time_part)
+                minutes = 0
+            
+            # Convert to 24-hour format
+            if is_pm and hours != 12:
+                hours += 12
+            elif not is_pm and hours == 12:
+                hours = 0
+                
+            return hours * 60 + minutes
+        
+        # Handle 24-hour format (e.g., "14:30", "09:00")
+        elif ':' in time_str:
+            hours, minutes = map(int, time_str.split(':'))
+            return hours * 60 + minutes
+        
+        # Handle single hour without minutes (e.g., "9", "17")
+        else:
+            hours = int(time_str)
+            return hours * 60
+    
+    except ValueError:
+        return 9999  # Invalid time format, put at the end
+
+
+def changed_days(event, old_ordinal, was_series):
+    """Ordinals whose events a change touched, or None if a series was involved (any day may be)"""
+    if was_series or event.rule is not None:
+        return None
+    return {ordinal for ordinal in (old_ordinal, event.ordinal) if ordinal is not None}
+
+
+def to_ordinal(value):
+    """Accept an ordinal, a date/datetime or an "M/D/YY" string"""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, date):
+        return value.toordinal()
+    return parse_date(value)
+
+
+class Event:
+    """A single calendar entry, a repeating series, or one occurrence of a series.
+
+    A series has a rule and its date is the first occurrence. Occurrences are
+    built on demand: their id is (series id, ordinal) and series_id is set.
+    """
+    __slots__ = ("id", "date", "ordinal", "name", "start_time", "end_time",
+                 "category", "extra", "rule", "series_id")
+
+    def __init__(self, event_id, date, name, start_time=None, end_time=None,
+                 category=None, extra=None, rule=None):
+        self.id = event_id
+        self.date = date
+        self.ordinal = parse_date(date)
+        self.name = name
+        self.start_time = start_time
+        self.end_time = end_time
+        self.category = category
+        self.extra = extra  # Unknown keys from the JSON file, kept for round-tripping
+        self.rule = rule
+        self.series_id = None
+        if rule is not None and self.ordinal is not None:
+            rule.bind(self.ordinal)
+
+    @classmethod
+    def from_dict(cls, event_id, data):
+        extra = {k: v for k, v in data.items() if k not in EVENT_FIELDS} or None
+        rule = Recurrence.from_dict(data["rrule"], parse_date) if data.get("rrule") else None
+        return cls(
+            event_id,
+            data.get("date", ""),
+            data.get("event", ""),
+            data.get("start_time"),
+            data.get("end_time"),
+            data.get("category"),
+            extra,
+            rule
+        )
+
+    def occurrence(self, ordinal):
+        """This series' occurrence on a given day, with any override applied"""
+        instance = Event((self.id, ordinal), format_date(ordinal), self.name,
+                         self.start_time, self.end_time, self.category)
+        instance.series_id = self.id
+        for key, value in self.rule.overrides.get(ordinal, {}).items():
+            if key in OVERRIDE_FIELDS:
+                setattr(instance, OVERRIDE_FIELDS[key], value)
+        return instance
+
+    def to_dict(self):
+        """Serialize using the calendar_data.json schema"""
+        data = {"id": self.id, "date": self.date, "event": self.name}
+        if self.start_time is not None:
+            data["start_time"] = self.start_time
+        if self.end_time is not None:
+            data["end_time"] = self.end_time
+        if self.category is not None:
+            data["category"] = self.category
+        if self.rule is not None:
+            data["rrule"] = self.rule.to_dict(format_date)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self):
+        return f"Event({self.id!r}, {self.date!r}, {self.name!r})"
+
+
+class EventStore:
+    """Events indexed by day, with incremental updates on add/update/remove"""
+
+    def __init__(self):
+        self._events = {}     # id -> Event, in insertion (file) order
+        self._by_day = {}     # ordinal -> [Event, ...]
+        self._days = []       # sorted ordinals that have at least one event
+        self._undated = []    # events whose date couldn't be parsed
+        self._series = {}     # id -> repeating Event, expanded at query time
+        self._next_id = 1
+        self._listeners = []
+        self.unreadable = []  # records from_dicts couldn't load, saved back unchanged
+        self.version = 0      # bumped on every change
+
+    @classmethod
+    def from_dicts(cls, records):
+        """Load JSON records; ones that aren't valid events go to store.unreadable"""
+        store = cls()
+        for record in records:
+            try:
+                store.add_dict(record)
+            except (ValueError, TypeError, KeyError, AttributeError):
+                store.unreadable.append(record)
+        for record in store.unreadable:
+            # Keep their ids out of use so the file stays consistent if they're fixed by hand
+            if isinstance(record, dict) and isinstance(record.get("id"), int):
+                store._next_id = max(store._next_id, record["id"] + 1)
+        store.version = 0
+        return store
+
+    def to_dicts(self):
+        return [event.to_dict() for event in self._events.values()] + self.unreadable
+
+    def __len__(self):
+        return len(self._events)
+
+    def __iter__(self):
+        return iter(self._events.values())
+
+    def get(self, event_id):
+        """An event, series or (series id, ordinal) occurrence by id"""
+        if isinstance(event_id, tuple):
+            series = self._series.get(event_id[0])
+            if series is None or not series.rule.occurs_on(series.ordinal, event_id[1]):
+                return None
+            return series.occurrence(event_id[1])
+        return self._events.get(event_id)
+
+    def subscribe(self, listener):
+        """Call listener(op, event, old_ordinal, was_series) after every change
+
+        op is "put" or "del". old_ordinal and was_series describe the event as
+        it was before the change (None/False for a new event), so caches can
+        drop the day it moved away from; see changed_days.
+        """
+        self._listeners.append(listener)
+
+    # ---- Mutations ----
+
+    def add(self, date, name, start_time="", end_time="", category="Intellectual", rule=None):
+        event = Event(self._take_id(), date, name, start_time, end_time, category, rule=rule)
+        self._insert(event)
+        return event
+
+    def add_dict(self, data):
+        """Add a record in the JSON schema, keeping its id if it has one"""
+        event_id = data.get("id")
+        if not isinstance(event_id, int) or event_id in self._events:
+            event_id = self._take_id()
+        else:
+            self._next_id = max(self._next_id, event_id + 1)
+        event = Event.from_dict(event_id, data)
+        self._insert(event)
+        return event
+
+    def put_dict(self, data):
+        """Insert or replace the record with data["id"] (used for journal replay)"""
+        existing = self._events.get(data.get("id"))
+        if existing is None:
+            return self.add_dict(data)
+        replacement = Event.from_dict(existing.id, data)
+        self._unindex(existing)
+        self._events[existing.id] = replacement
+        self._index(replacement)
+        self._changed("put", replacement, existing.ordinal, existing.rule is not None)
+        return replacement
+
+    def update(self, event_id, **changes):
+        """Change fields of an existing event (keys: date, name, start_time, end_time, category, rule)
+
+        Updating an occurrence id only changes that day of the series.
+        """
+        for field in changes:
+            if field not in Event.__slots__ or field in ("id", "ordinal", "series_id"):
+                raise AttributeError(f"Unknown event field: {field}")
+        if isinstance(event_id, tuple):
+            return self._update_occurrence(event_id, changes)
+
+        event = self._events[event_id]
+        old_ordinal, was_series = event.ordinal, event.rule is not None
+        new_date = changes.pop("date", event.date)
+        reindex = new_date != event.date or "rule" in changes
+        if reindex:
+            self._unindex(event)
+        for field, value in changes.items():
+            setattr(event, field, value)
+        if reindex:
+            event.date = new_date
+            event.ordinal = parse_date(new_date)
+            self._index(event)
+        if event.rule is not None and event.ordinal is not None:
+            event.rule.bind(event.ordinal)
+        self._changed("put", event, old_ordinal, was_series)
+        return event
+
+    def remove(self, event_id):
+        """Delete an event or a whole series; an occurrence id skips just that day"""
+        if isinstance(event_id, tuple):
+            series_id, ordinal = event_id
+            series = self._series[series_id]
+            instance = series.occurrence(ordinal)
+            series.rule.exdates.add(ordinal)
+            series.rule.overrides.pop(ordinal, None)
+            self._changed("put", series, series.ordinal, True)
+            return instance
+
+        event = self._events.pop(event_id)
+        self._unindex(event)
+        self._changed("del", event, event.ordinal, event.rule is not None)
+        return event
+
+    def _update_occurrence(self, event_id, changes):
+        series_id, ordinal = event_id
+        series = self._series[series_id]
+        if "rule" in changes:
+            raise AttributeError("Change the rule on the series, not on one occurrence")
+
+        new_date = changes.pop("date", None)
+        if new_date is not None and parse_date(new_date) != ordinal:
+            # Moving one occurrence: skip it in the series and add it as a one-off event
+            instance = series.occurrence(ordinal)
+            for field, value in changes.items():
+                setattr(instance, field, value)
+            self.remove(event_id)
+            return self.add(new_date, instance.name, instance.start_time,
+                            instance.end_time, instance.category)
+
+        override = series.rule.overrides.setdefault(ordinal, {})
+        keys = {attribute: key for key, attribute in OVERRIDE_FIELDS.items()}
+        for field, value in changes.items():
+            override[keys[field]] = value
+        self._changed("put", series, series.ordinal, True)
+        return series.occurrence(ordinal)
+
+    # ---- Queries ----
+
+    def events_on(self, day):
+        """Events on a single day (one-off events first, then series occurrences)"""
+        ordinal = to_ordinal(day)
+        if ordinal is None:
+            return []
+        events = list(self._by_day.get(ordinal, ()))
+        for series in self._series.values():
+            if series.rule.occurs_on(series.ordinal, ordinal):
+                events.append(series.occurrence(ordinal))
+        return events
+
+    def events_between(self, start, end):
+        """Events from start to end (inclusive), in date order"""
+        start, end = to_ordinal(start), to_ordinal(end)
+        lo = bisect_left(self._days, start)
+        hi = bisect_right(self._days, end)
+        occurrences = self._occurrences_between(start, end)
+        if not occurrences:
+            result = []
+            for ordinal in self._days[lo:hi]:
+                result.extend(self._by_day[ordinal])
+            return result
+
+        result = []
+        for ordinal in sorted(set(self._days[lo:hi]).union(occurrences)):
+            result.extend(self._by_day.get(ordinal, ()))
+            result.extend(occurrences.get(ordinal, ()))
+        return result
+
+    def _occurrences_between(self, start, end):
+        """{ordinal: [occurrence, ...]} for every series from start to end"""
+        occurrences = {}
+        for series in self._series.values():
+            for ordinal in series.rule.between(series.ordinal, start, end):
+                occurrences.setdefault(ordinal, []).append(series.occurrence(ordinal))
+        return occurrences
+
+    def series(self):
+        """All repeating events"""
+        return list(self._series.values())
+
+    def events_in_week(self, day):
+        """Events in the Monday-Sunday week containing day"""
+        ordinal = to_ordinal(day)
+        monday = ordinal - date.fromordinal(ordinal).weekday()
+        return self.events_between(monday, monday + 6)
+
+    def events_in_month(self, year, month):
+        first = date(year, month, 1)
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+        return self.events_between(first.toordinal(), next_month.toordinal() - 1)
+
+    def days_between(self, start, end):
+        """Ordinals of days that have events, from start to end (inclusive)"""
+        start, end = to_ordinal(start), to_ordinal(end)
+        days = self._days[bisect_left(self._days, start):bisect_right(self._days, end)]
+        if not self._series:
+            return days
+        days = set(days)
+        for series in self._series.values():
+            days.update(series.rule.between(series.ordinal, start, end))
+        return sorted(days)
+
+    def months(self):
+        """(year, month) pairs that have events, in order"""
+        months = set()
+        for ordinal in self._days:
+            d = date.fromordinal(ordinal)
+            months.add((d.year, d.month))
+        for series in self._series.values():
+            first = date.fromordinal(series.ordinal)
+            last = date.fromordinal(self._series_end(series))
+            for index in range(first.year * 12 + first.month - 1, last.year * 12 + last.month):
+                year, month = divmod(index, 12)
+                months.add((year, month + 1))
+        return sorted(months)
+
+    def dates(self):
+        """All days with events, as sorted date objects"""
+        if not self._series:
+            return [date.fromordinal(o) for o in self._days]
+        first = min([s.ordinal for s in self._series.values()] + self._days[:1])
+        last = max([self._series_end(s) for s in self._series.values()] + self._days[-1:])
+        return [date.fromordinal(o) for o in self.days_between(first, last)]
+
+    def _series_end(self, series):
+        """Last day to list for a series (open-ended ones stop a year past the other events)"""
+        if series.rule.last is not None:
+            return series.rule.last
+        latest = max(self._days[-1] if self._days else series.ordinal, series.ordinal)
+        return latest + OPEN_SERIES_HORIZON
+
+    # ---- Internal index maintenance ----
+
+    def _take_id(self):
+        event_id = self._next_id
+        self._next_id += 1
+        return event_id
+
+    def _insert(self, event):
+        self._events[event.id] = event
+        self._index(event)
+        self._changed("put", event)
+
+    def _changed(self, op, event, old_ordinal=None, was_series=False):
+        self.version += 1
+        for listener in self._listeners:
+            listener(op, event, old_ordinal, was_series)
+
+    def _index(self, event):
+        if event.ordinal is None:
+            self._undated.append(event)
+            return
+        if event.rule is not None:
+            self._series[event.id] = event
+            return
+        bucket = self._by_day.get(event.ordinal)
+        if bucket is None:
+            self._by_day[event.ordinal] = [event]
+            insort(self._days, event.ordinal)
+        else:
+            bucket.append(event)
+
+    def _unindex(self, event):
+        if event.ordinal is None:
+            self._undated.remove(event)
+            return
+        if event.rule is not None:
+            del self._series[event.id]
+            return
+        bucket = self._by_day[event.ordinal]
+        bucket.remove(event)
+        if not bucket:
+            del self._by_day[event.ordinal]
+            del self._days[bisect_left(self._days, event.ordinal)]
@@ -0,0 +1,189 @@
+"""
+Compress repeated events in calendar_data.json into recurring series.
+
+Finds events that were saved once per day (e.g. a daily "Praying the Rosary"
+at 11:00 AM) and replaces each run with a single daily/weekly/monthly series,
+keeping missing days as exceptions and days with different times as
+overrides. The expanded calendar is checked against the original before
+anything is written, and the original file is kept as calendar_data.json.bak.
+
+Close the app before running this.
+
+Usage: python migrate_recurring.py [calendar_data.json] [--dry-run] [--min-occurrences N]
+"""
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from datetime import date
+
+from event_store import EventStore, format_date, parse_date
+from recurrence import Recurrence
+from storage import JournalStorage, StorageError
+
+MIN_OCCURRENCES = 4
+MAX_MISS_RATIO = 0.25  # At most this share of a series may be exceptions or leftovers
+SERIES_FIELDS = ("start_time", "end_time", "category")
+
+
+def _weekly_days(ordinals, first, last):
+    """Weekdays that occur in most weeks of the run"""
+    weeks = (last - first) // 7 + 1
+    counts = Counter(date.fromordinal(o).weekday() for o in ordinals)
+    return sorted(d for d, n in counts.items() if n >= max(2, weeks // 2))
+
+
+def _candidates(ordinals):
+    """Possible rules for a run of days, as (rule, generated ordinals)"""
+    first, last = ordinals[0], ordinals[-1]
+    daily = Recurrence("daily")
+    yield daily, list(range(first, last + 1))
+
+    weekdays = _weekly_days(ordinals, first, last)
+    if weekdays and len(weekdays) < 7:
+        weekly = Recurrence("weekly", weekdays=weekdays)
+        start = next((o for o in ordinals if date.fromordinal(o).weekday() in weekdays), first)
+        weekly.bind(start)
+        yield weekly, [o for o in range(start, last + 1) if date.fromordinal(o).weekday() in weekdays]
+
+    monthly = Recurrence("monthly").bind(first)
+    yield monthly, monthly.between(first, first, last)
+
+
+def _field(record, key):
+    return record.get(key) or ""
+
+
+def find_series(records, min_occurrences=MIN_OCCURRENCES):
+    """Return (new records, [(series record, folded count), ...])"""
+    groups = {}
+    for index, record in enumerate(records):
+        if not isinstance(record, dict) or record.get("rrule") or set(record) - {"id", "date", "event", *SERIES_FIELDS}:
+            continue  # Already a series, or carries extra data we shouldn't fold
+        ordinal = parse_date(record.get("date", ""))
+        if ordinal is None:
+            continue
+        days = groups.setdefault(record.get("event", ""), {})
+        days.setdefault(ordinal, index)  # Second event with the same name on a day stays as is
+
+    replaced = {}   # index of a folded record -> series record (or None to drop it)
+    created = []
+    for name, days in groups.items():
+        if len(days) < min_occurrences:
+            continue
+        ordinals = sorted(days)
+
+        best = None
+        for rule, generated in _candidates(ordinals):
+            covered = [o for o in generated if o in days]
+            misses = len(generated) - len(covered)
+            leftovers = len(ordinals) - len(covered)
+            if len(covered) < min_occurrences or misses + leftovers > MAX_MISS_RATIO * len(ordinals):
+                continue
+            if best is None or misses + leftovers < best[0]:
+                best = (misses + leftovers, rule, generated, covered)
+        if best is None:
+            continue
+
+        _, rule, generated, covered = best
+        members = [records[days[o]] for o in covered]
+        base = Counter(tuple(_field(r, k) for k in SERIES_FIELDS) for r in members).most_common(1)[0][0]
+        base_fields = dict(zip(SERIES_FIELDS, base))
+
+        start = covered[0]
+        rule = Recurrence(rule.freq, weekdays=rule.weekdays, until=covered[-1])
+        rule.bind(start)
+        rule.exdates = {o for o in generated if start <= o <= covered[-1]} - set(covered)
+        for ordinal, record in zip(covered, members):
+            changed = {k: _field(record, k) for k in SERIES_FIELDS if _field(record, k) != base_fields[k]}
+            if changed:
+                rule.overrides[ordinal] = changed
+
+        series = {"date": format_date(start), "event": name, **base_fields,
+                  "rrule": rule.to_dict(format_date)}
+        if "id" in members[0]:
+            series["id"] = members[0]["id"]
+        indexes = sorted(days[o] for o in covered)
+        replaced[indexes[0]] = series
+        for index in indexes[1:]:
+            replaced[index] = None
+        created.append((series, len(covered)))
+
+    new_records = []
+    for index, record in enumerate(records):
+        if index in replaced:
+            if replaced[index] is not None:
+                new_records.append(replaced[index])
+        else:
+            new_records.append(record)
+    return new_records, created
+
+
+def _expanded(records):
+    """Every occurrence as comparable tuples, for checking the migration"""
+    store = EventStore.from_dicts(records)
+    if not len(store):
+        return Counter()
+    days = [e.ordinal for e in store if e.ordinal is not None]
+    events = store.events_between(min(days), max(days + [s.rule.last or 0 for s in store.series()]))
+    return Counter((e.ordinal, e.name, e.start_time or "", e.end_time or "", e.category or "")
+                   for e in events)
+
+
+def _saved_size(records):
+    return len(json.dumps(records, separators=(",", ":")).encode("utf-8"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fold repeated events into recurring series.")
+    parser.add_argument("path", nargs="?", default="calendar_data.json")
+    parser.add_argument("--dry-run", action="store_true", help="report only, don't write")
+    parser.add_argument("--min-occurrences", type=int, default=MIN_OCCURRENCES)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        print(f"❌ {args.path} not found")
+        return 1
+
+    storage = JournalStorage(args.path)
+    try:
+        # Leave an unreadable file where it is; the app sets it aside and tells the user
+        store = storage.load(migrate=not args.dry_run, set_aside=False)
+    except (StorageError, OSError) as e:
+        print(f"❌ {e}")
+        return 1
+    records = store.to_dicts()
+
+    new_records, created = find_series(records, args.min_occurrences)
+    if _expanded(new_records) != _expanded(records):
+        print("❌ Compressed calendar doesn't match the original; nothing was written.")
+        return 1
+
+    print(f"📅 {args.path}")
+    for series, folded in created:
+        rule = Recurrence.from_dict(series["rrule"], parse_date)
+        print(f"   🔁 {series['event']}: {folded} events -> {rule.describe()}"
+              f" ({len(rule.exdates)} exceptions, {len(rule.overrides)} overrides)")
+    # Both sides as the compact JSON the app saves, so whitespace in the file doesn't count
+    size_before = _saved_size(records)
+    size_after = _saved_size(new_records)
+    print(f"\n   Records: {len(records):,} -> {len(new_records):,}")
+    print(f"   Saved size: {size_before:,} -> {size_after:,} bytes "
+          f"({100 - 100 * size_after / max(size_before, 1):.0f}% smaller)")
+
+    if args.dry_run or not created:
+        print("\nNo changes written." if created else "\nNothing to compress.")
+        return 0
+
+    backup = args.path + ".bak"
+    if not os.path.exists(backup):
+        with open(backup, "wb") as dst, open(args.path, "rb") as src:
+            dst.write(src.read())
+    storage.rewrite(new_records)
+    print(f"\n✅ Saved. The original is kept as {backup}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
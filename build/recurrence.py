@@ -0,0 +1,137 @@
+"""
+Recurrence rules for repeating events (RRULE-style daily/weekly/monthly).
+A series is stored once, with its rule, and only expanded into occurrences for
+the dates being looked at. Skipped days (exdates) and per-day changes
+(overrides) are kept on the rule.
+"""
+from datetime import date
+
+FREQUENCIES = ("daily", "weekly", "monthly")
+WEEKDAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+
+class Recurrence:
+    __slots__ = ("freq", "interval", "weekdays", "until", "count", "exdates",
+                 "overrides", "last")
+
+    def __init__(self, freq, interval=1, weekdays=None, until=None, count=None,
+                 exdates=None, overrides=None):
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unknown repeat frequency: {freq}")
+        self.freq = freq
+        self.interval = max(1, int(interval))
+        self.weekdays = tuple(sorted(set(weekdays))) if weekdays else None
+        self.until = until                      # ordinal of the last allowed day, or None
+        self.count = count                      # number of occurrences, or None
+        self.exdates = set(exdates or ())       # ordinals of skipped occurrences
+        self.overrides = dict(overrides or {})  # ordinal -> {field: value}
+        self.last = until                       # last occurrence, set by bind()
+
+    def bind(self, start):
+        """Work out the last occurrence for a series starting on start"""
+        if self.freq == "weekly" and not self.weekdays:
+            self.weekdays = (date.fromordinal(start).weekday(),)
+        self.last = self.until
+        if self.count:
+            for n, ordinal in enumerate(self._raw(start, start), 1):
+                if self.until is not None and ordinal > self.until:
+                    break
+                if n == self.count:
+                    self.last = ordinal
+                    break
+        return self
+
+    # ---- Expansion ----
+
+    def between(self, start, lo, hi):
+        """Occurrence ordinals from lo to hi (inclusive), skipping exdates"""
+        if self.last is not None:
+            hi = min(hi, self.last)
+        result = []
+        if hi < start or hi < lo:
+            return result
+        for ordinal in self._raw(start, lo):
+            if ordinal > hi:
+                break
+            if ordinal not in self.exdates:
+                result.append(ordinal)
+        return result
+
+    def occurs_on(self, start, ordinal):
+        return bool(self.between(start, ordinal, ordinal))
+
+    def _raw(self, start, lo):
+        """Every occurrence on or after lo, ignoring until/count/exdates (endless)"""
+        lo = max(lo, start)
+        if self.freq == "daily":
+            ordinal = start + -(-(lo - start) // self.interval) * self.interval
+            while True:
+                yield ordinal
+                ordinal += self.interval
+
+        elif self.freq == "weekly":
+            first_monday = start - date.fromordinal(start).weekday()
+            step = 7 * self.interval
+            week = first_monday + (lo - first_monday) // step * step
+            while True:
+                for weekday in self.weekdays:
+                    ordinal = week + weekday
+                    if ordinal >= lo:
+                        yield ordinal
+                week += step
+
+        else:  # monthly, on the start date's day of month (months without that day are skipped)
+            first = date.fromordinal(start)
+            lo_date = date.fromordinal(lo)
+            month = first.year * 12 + first.month - 1
+            behind = lo_date.year * 12 + lo_date.month - 1 - month
+            month += max(0, behind // self.interval) * self.interval
+            while True:
+                year, month_index = divmod(month, 12)
+                try:
+                    ordinal = date(year, month_index + 1, first.day).toordinal()
+                except ValueError:
+                    ordinal = None
+                if ordinal is not None and ordinal >= lo:
+                    yield ordinal
+                month += self.interval
+
+    # ---- JSON (dates are "M/D/YY" strings; the event store passes in its converters) ----
+
+    @classmethod
+    def from_dict(cls, data, parse_date):
+        return cls(
+            data.get("freq", "daily"),
+            data.get("interval", 1),
+            [WEEKDAY_CODES.index(code) for code in data.get("byday", ())],
+            parse_date(data["until"]) if data.get("until") else None,
+            data.get("count"),
+            {parse_date(d) for d in data.get("exdates", ())} - {None},
+            {parse_date(d): fields for d, fields in data.get("overrides", {}).items()
+             if parse_date(d) is not None}
+        )
+
+    def to_dict(self, format_date):
+        data = {"freq": self.freq}
+        if self.interval != 1:
+            data["interval"] = self.interval
+        if self.freq == "weekly" and self.weekdays:
+            data["byday"] = [WEEKDAY_CODES[d] for d in self.weekdays]
+        if self.until is not None:
+            data["until"] = format_date(self.until)
+        if self.count:
+            data["count"] = self.count
+        if self.exdates:
+            data["exdates"] = [format_date(d) for d in sorted(self.exdates)]
+        if self.overrides:
+            # Copies: the snapshot writer serializes these on another thread
+            data["overrides"] = {format_date(d): dict(fields) for d, fields in sorted(self.overrides.items())}
+        return data
+
+    def describe(self):
+        """Short text such as: every week on MO, WE"""
+        every = {"daily": "day", "weekly": "week", "monthly": "month"}[self.freq]
+        text = f"every {every}" if self.interval == 1 else f"every {self.interval} {every}s"
+        if self.freq == "weekly" and self.weekdays:
+            text += " on " + ", ".join(WEEKDAY_CODES[d] for d in self.weekdays)
+        return text
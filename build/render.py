@@ -0,0 +1,215 @@
+"""
+Rendering for the event list and the month grid.
+
+Each event's sort time, time block, display text and colors are worked out
+once and cached by event id until the store reports a change to that event.
+The listbox is updated by diffing the new rows against the rows already shown,
+so a date click or an edit only deletes, inserts or recolors the rows that
+differ. Month markers are one tkcalendar calevent per day, built the first
+time a month is shown and then patched day by day as events change.
+"""
+from collections import Counter
+from datetime import date
+
+from event_store import changed_days, parse_time_for_sorting
+
+# Color scheme for categories - New categories: Spiritual, Physical, Emotional, Intellectual
+CATEGORY_COLORS = {
+    "Spiritual": {"bg": "#9B59B6", "fg": "white"},      # Purple
+    "Physical": {"bg": "#E74C3C", "fg": "white"},       # Red
+    "Emotional": {"bg": "#F39C12", "fg": "white"},      # Orange
+    "Intellectual": {"bg": "#3498DB", "fg": "white"}    # Blue
+}
+DEFAULT_CATEGORY = "Intellectual"
+HEADER_COLORS = ("#34495e", "white")
+
+BLOCK_ORDER = ("Morning", "Afternoon", "Evening", "Night", "All Day")
+BLOCK_EMOJIS = {
+    "Morning": "🌅",
+    "Afternoon": "☀️",
+    "Evening": "🌆",
+    "Night": "🌙",
+    "All Day": "📅"
+}
+
+
+def time_block(minutes):
+    """Which time block a start time (minutes from midnight) belongs to"""
+    if minutes >= 9999:  # Invalid or no time
+        return "All Day"
+    if minutes < 12 * 60:  # Before noon
+        return "Morning"
+    elif minutes < 17 * 60:  # Before 5 PM
+        return "Afternoon"
+    elif minutes < 21 * 60:  # Before 9 PM
+        return "Evening"
+    return "Night"
+
+
+def row_text(event):
+    """Listbox text for an event, based on the time information it has"""
+    start_time = event.start_time or ""
+    end_time = event.end_time or ""
+    if start_time and end_time:
+        text = f"   🕐 {start_time} - {end_time} — {event.name}"
+    elif start_time:
+        text = f"   🕐 {start_time} — {event.name}"
+    else:
+        text = f"   {event.name}"
+    if event.series_id is not None:
+        text += "  🔁"
+    return text
+
+
+class RowCache:
+    """(minutes, block, text, bg, fg) per event, dropped when the store changes the event"""
+
+    def __init__(self, store):
+        self._rows = {}
+        self._by_series = {}  # series id -> ids of its cached occurrences
+        store.subscribe(self._on_change)
+
+    def _on_change(self, op, event, old_ordinal, was_series):
+        self._rows.pop(event.id, None)
+        for occurrence_id in self._by_series.pop(event.id, ()):
+            self._rows.pop(occurrence_id, None)
+
+    def row(self, event):
+        row = self._rows.get(event.id)
+        if row is None:
+            minutes = parse_time_for_sorting(event.start_time or "")
+            colors = CATEGORY_COLORS.get(event.category or DEFAULT_CATEGORY, CATEGORY_COLORS[DEFAULT_CATEGORY])
+            row = (minutes, time_block(minutes), row_text(event), colors["bg"], colors["fg"])
+            self._rows[event.id] = row
+            if event.series_id is not None:
+                self._by_series.setdefault(event.series_id, set()).add(event.id)
+        return row
+
+    def model(self, events):
+        """Listbox rows [(text, bg, fg, event or None), ...]: events by time, under block headers"""
+        keyed = sorted(((self.row(event), event) for event in events), key=lambda item: item[0][0])
+        blocks = {name: [] for name in BLOCK_ORDER}
+        for (_, block, text, bg, fg), event in keyed:
+            blocks[block].append((text, bg, fg, event))
+
+        rows = []
+        for name in BLOCK_ORDER:
+            if blocks[name]:
+                rows.append((f"{BLOCK_EMOJIS[name]} {name}", *HEADER_COLORS, None))
+                rows.extend(blocks[name])
+        return rows
+
+
+class ListboxRenderer:
+    def __init__(self, listbox):
+        self.listbox = listbox
+        self._shown = []  # (text, bg, fg) for each row currently in the listbox
+
+    def render(self, rows):
+        """Show rows, touching only the ones that changed; returns {listbox index: event}"""
+        new = [row[:3] for row in rows]
+        old = self._shown
+
+        # Rows matching at the start and end stay as they are
+        limit = min(len(old), len(new))
+        head = 0
+        while head < limit and old[head] == new[head]:
+            head += 1
+        tail = 0
+        while tail < limit - head and old[len(old) - 1 - tail] == new[len(new) - 1 - tail]:
+            tail += 1
+        old_changed = old[head:len(old) - tail]
+        new_changed = new[head:len(new) - tail]
+
+        if [r[0] for r in old_changed] == [r[0] for r in new_changed]:
+            # Same text, so only colors differ (e.g. a category edit)
+            for offset, (old_row, new_row) in enumerate(zip(old_changed, new_changed)):
+                if old_row != new_row:
+                    self.listbox.itemconfig(head + offset, bg=new_row[1], fg=new_row[2])
+        else:
+            if old_changed:
+                self.listbox.delete(head, head + len(old_changed) - 1)
+            if new_changed:
+                self.listbox.insert(head, *[text for text, _, _ in new_changed])
+                for offset, (_, bg, fg) in enumerate(new_changed):
+                    self.listbox.itemconfig(head + offset, bg=bg, fg=fg)
+
+        self._shown = new
+        return {index: row[3] for index, row in enumerate(rows) if row[3] is not None}
+
+
+def day_summary(events):
+    """((category, count), ...) for a day, most common category first"""
+    counts = Counter(event.category or DEFAULT_CATEGORY for event in events)
+    return tuple(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+class MonthMarkers:
+    def __init__(self, calendar, store, schedule=None):
+        self.calendar = calendar
+        self.store = store
+        self._schedule = schedule  # e.g. root.after_idle, to batch a burst of changes into one pass
+        self._months = set()       # (year, month) pairs already marked
+        self._marks = {}           # ordinal -> (summary, calevent id)
+        self._dirty = set()
+        self._pending = False
+        for category, colors in CATEGORY_COLORS.items():
+            calendar.tag_config(category, background=colors["bg"], foreground=colors["fg"])
+        store.subscribe(self._on_change)
+
+    def show_month(self, year, month):
+        """Mark each day of a month that has events, the first time the month is shown"""
+        if (year, month) in self._months:
+            return
+        self._months.add((year, month))
+        first = date(year, month, 1).toordinal()
+        last = date(year + month // 12, month % 12 + 1, 1).toordinal() - 1
+        for ordinal in self.store.days_between(first, last):
+            self._mark(ordinal)
+
+    def _on_change(self, op, event, old_ordinal, was_series):
+        days = changed_days(event, old_ordinal, was_series)
+        if days is None:
+            for year, month in self._months:
+                first = date(year, month, 1).toordinal()
+                last = date(year + month // 12, month % 12 + 1, 1).toordinal() - 1
+                self._dirty.update(range(first, last + 1))
+        else:
+            self._dirty.update(days)
+
+        if self._schedule is None:
+            self.flush()
+        elif not self._pending:
+            self._pending = True
+            self._schedule(self.flush)
+
+    def flush(self):
+        """Apply pending day changes to the calendar"""
+        self._pending = False
+        dirty, self._dirty = self._dirty, set()
+        for ordinal in dirty:
+            d = date.fromordinal(ordinal)
+            if (d.year, d.month) in self._months:
+                self._mark(ordinal)
+
+    def _mark(self, ordinal):
+        events = self.store.events_on(ordinal)
+        summary = day_summary(events)
+
+        old = self._marks.get(ordinal)
+        if old and old[0] == summary:
+            return
+        if not summary:
+            if old:
+                self.calendar.calevent_remove(old[1])
+                del self._marks[ordinal]
+            return
+
+        text = ", ".join(f"{count} {category}" for category, count in summary)
+        tags = [summary[0][0]]  # The day is colored by its most common category
+        if old:
+            self.calendar.calevent_configure(old[1], text=text, tags=tags)
+            ev_id = old[1]
+        else:
+            ev_id = self.calendar.calevent_create(date.fromordinal(ordinal), text, tags)
+        self._marks[ordinal] = (summary, ev_id)
@@ -1,26 +1,30 @@
+from startup import StartupTimer
+startup = StartupTimer()  # Started before the heavier imports below
+
 import tkinter as tk
 from tkinter import messagebox, simpledialog, scrolledtext, ttk
 from tkcalendar import Calendar
-import anthropic
-import json
+import argparse
+import threading
 from datetime import datetime
 from dotenv import load_dotenv
 import os
-import requests
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Color scheme for categories - New categories: Spiritual, Physical, Emotional, Intellectual
-CATEGORY_COLORS = {
-    "Spiritual": {"bg": "#9B59B6", "fg": "white"},      # Purple
-    "Physical": {"bg": "#E74C3C", "fg": "white"},       # Red
-    "Emotional": {"bg": "#F39C12", "fg": "white"},      # Orange
-    "Intellectual": {"bg": "#3498DB", "fg": "white"}    # Blue
-}
+from weather import WeatherService
+from ai_chat import ChatWorker, parse_add_event
+from ai_tools import TOOLS
+from core import ScheduleCore, make_rule
+from render import CATEGORY_COLORS, ListboxRenderer, MonthMarkers
+# anthropic and requests are imported on first use (see get_ai_client and weather.py)
+startup.mark("imports")
 
 class ScheduleApp:
-    def __init__(self, root):
+    def __init__(self, root, startup_log=None):
+        self.startup = startup
+        self.startup.mark("tk root")
+        # Load environment variables from .env file
+        load_dotenv()
+        self.startup_log = startup_log or os.getenv("STARTUP_LOG")
+
         self.root = root
         self.root.title("AI Scheduler with Weather Forecast")
         self.root.geometry("1600x900")
@@ -36,169 +40,44 @@ class ScheduleApp:
         self.data_file = "calendar_data.json"
         self.weather_api_key = os.getenv("OPENWEATHER_API_KEY")
         self.weather_location = os.getenv("WEATHER_LOCATION", "Martinsville,IN,US")
-        
-        self.schedule = self.load_course_schedule()
+        self.weather = WeatherService(
+            self.weather_api_key,
+            self.weather_location,
+            deliver=self.run_on_ui_thread
+        )
+        self.ai_client = None
+        self.ai_client_lock = threading.Lock()
+        
+        # The calendar is loaded in the background once the window is showing
+        self.core = None
+        self.store = None
+        self.context_builder = None
+        self.calendar_tools = None
+        self.month_markers = None
+        self.prompt_stats = []  # One entry per chat turn, for measuring prompt size
         self.listbox_index_to_event = {}  # NEW: Map listbox indices to events
         self.create_widgets()
+        self.startup.mark("window built")
         
         # Save on exit
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-
-    def parse_time_for_sorting(self, time_str):
-        """Convert time string to minutes from midnight for sorting"""
-        if not time_str:
-            return 9999  # Put events without time at the end
-        
-        time_str = time_str.strip().upper()
-        
+        # Idle callbacks run after Tk's own redraws, so this fires once the window is painted
+        self.root.after_idle(self.finish_startup)
+
+    def get_ai_client(self):
+        """One Anthropic client per app, created on first use and then reused"""
+        with self.ai_client_lock:
+            if self.ai_client is None:
+                import anthropic  # Slow to import; the first chat message pays for it on the worker thread
+                self.ai_client = anthropic.Anthropic()
+            return self.ai_client
+
+    def run_on_ui_thread(self, callback, *args):
+        """Hand a result from a worker thread back to the Tk event loop"""
         try:
-            # Handle 12-hour format (e.g., "2:30 PM", "10:00 AM")
-            if 'AM' in time_str or 'PM' in time_str:
-                time_part = time_str.replace('AM', '').replace('PM', '').strip()
-                is_pm = 'PM' in time_str
-                
-                if ':' in time_part:
-                    hours, minutes = map(int, time_part.split(':'))
-                else:
-                    hours = int(time_part)
-                    minutes = 0
-                
-                # Convert to 24-hour format
-                if is_pm and hours != 12:
-                    hours += 12
-                elif not is_pm and hours == 12:
-                    hours = 0
-                    
-                return hours * 60 + minutes
-            
-            # Handle 24-hour format (e.g., "14:30", "09:00")
-            elif ':' in time_str:
-                hours, minutes = map(int, time_str.split(':'))
-                return hours * 60 + minutes
-            
-            # Handle single hour without minutes (e.g., "9", "17")
-            else:
-                hours = int(time_str)
-                return hours * 60
-        
-        except ValueError:
-            return 9999  # Invalid time format, put at the end
-
-    def get_category(self, event_text):
-        """Determine category based on event text"""
-        text_lower = event_text.lower()
-        # Map old categories to new ones for compatibility
-        if "spiritual" in text_lower or "meditation" in text_lower or "prayer" in text_lower:
-            return "Spiritual"
-        elif "physical" in text_lower or "exercise" in text_lower or "gym" in text_lower:
-            return "Physical"
-        elif "emotional" in text_lower or "therapy" in text_lower or "support" in text_lower:
-            return "Emotional"
-        elif "intellectual" in text_lower or "learning" in text_lower or "study" in text_lower:
-            return "Intellectual"
-        # Default to Intellectual for assignments/quizzes
-        return "Intellectual"
-
-    def get_weather_for_date(self, date_str):
-        """Fetch weather forecast for a specific date"""
-        if not self.weather_api_key:
-            return "Weather API key not configured.\nAdd OPENWEATHER_API_KEY to .env file."
-        
-        try:
-            # Parse and compare dates using date-only
-            date_obj = datetime.strptime(date_str, "%m/%d/%y").date()
-            today = datetime.now().date()
-            
-            # Calculate days from today
-            days_diff = (date_obj - today).days
-            
-            # If the date is today, get current weather
-            if days_diff == 0:
-                url = f"https://api.openweathermap.org/data/2.5/weather?q={self.weather_location}&appid={self.weather_api_key}&units=imperial"
-                response = requests.get(url, timeout=5)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    temp = data['main']['temp']
-                    description = data['weather'][0]['description']
-                    feels_like = data['main']['feels_like']
-                    humidity = data['main']['humidity']
-                    wind_speed = data['wind']['speed']
-                    
-                    weather_text = f"📍 {self.weather_location}\n"
-                    weather_text += f"📅 {date_obj.strftime('%B %d, %Y')} (Today)\n\n"
-                    weather_text += f"🌡️ {temp:.0f}°F (feels like {feels_like:.0f}°F)\n"
-                    weather_text += f"☁️ {description.capitalize()}\n"
-                    weather_text += f"💧 Humidity: {humidity}%\n"
-                    weather_text += f"💨 Wind: {wind_speed:.1f} mph"
-                    
-                    return weather_text
-                else:
-                    return f"Could not fetch weather\n(Error: {response.status_code})"
-            
-            # For future dates (up to 5 days), use forecast API
-            elif 0 < days_diff <= 5:
-                url = f"https://api.openweathermap.org/data/2.5/forecast?q={self.weather_location}&appid={self.weather_api_key}&units=imperial"
-                response = requests.get(url, timeout=5)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Find forecasts for the target date
-                    target_date_str = date_obj.strftime("%Y-%m-%d")
-                    matching_forecasts = [
-                        f for f in data['list'] 
-                        if f['dt_txt'].startswith(target_date_str)
-                    ]
-                    
-                    if matching_forecasts:
-                        # Use the midday forecast (around noon) if available
-                        midday_forecast = None
-                        for f in matching_forecasts:
-                            hour = int(f['dt_txt'].split()[1].split(':')[0])
-                            if 11 <= hour <= 14:  # Between 11 AM and 2 PM
-                                midday_forecast = f
-                                break
-                        
-                        # If no midday forecast, use the first one
-                        forecast = midday_forecast or matching_forecasts[0]
-                        
-                        temp = forecast['main']['temp']
-                        feels_like = forecast['main']['feels_like']
-                        description = forecast['weather'][0]['description']
-                        humidity = forecast['main']['humidity']
-                        wind_speed = forecast['wind']['speed']
-                        
-                        # Get high/low for the day
-                        temps = [f['main']['temp'] for f in matching_forecasts]
-                        temp_max = max(temps)
-                        temp_min = min(temps)
-                        
-                        weather_text = f"📍 {self.weather_location}\n"
-                        weather_text += f"📅 {date_obj.strftime('%B %d, %Y')}\n"
-                        weather_text += f"({days_diff} day{'s' if days_diff > 1 else ''} from now)\n\n"
-                        weather_text += f"🌡️ High: {temp_max:.0f}°F / Low: {temp_min:.0f}°F\n"
-                        weather_text += f"   Around noon: {temp:.0f}°F (feels like {feels_like:.0f}°F)\n"
-                        weather_text += f"☁️ {description.capitalize()}\n"
-                        weather_text += f"💧 Humidity: {humidity}%\n"
-                        weather_text += f"💨 Wind: {wind_speed:.1f} mph"
-                        
-                        return weather_text
-                    else:
-                        return f"No forecast available for\n{date_obj.strftime('%B %d, %Y')}"
-                else:
-                    return f"Could not fetch forecast\n(Error: {response.status_code})"
-            
-            # For past dates or dates beyond 5 days
-            elif days_diff < 0:
-                return f"📅 {date_obj.strftime('%B %d, %Y')}\n\n⏮️ This date has passed.\nWeather data not available for past dates."
-            else:
-                return f"📅 {date_obj.strftime('%B %d, %Y')}\n\n🔮 Forecast only available\nfor the next 5 days.\n\n(This date is {days_diff} days away)"
-                
-        except requests.exceptions.RequestException as e:
-            return f"Network error:\n{str(e)}"
-        except Exception as e:
-            return f"Error:\n{str(e)}"
+            self.root.after(0, callback, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # Window already closed
 
     def create_widgets(self):
         # Header
@@ -248,6 +127,7 @@ class ScheduleApp:
         )
         self.calendar.pack(pady=10, padx=10)
         self.calendar.bind("<<CalendarSelected>>", self.on_date_select)
+        self.calendar.bind("<<CalendarMonthChanged>>", self.on_month_changed)
 
         # Ensure the initial selection is today
         self.calendar.selection_set(today)
@@ -310,6 +190,8 @@ class ScheduleApp:
         )
         self.event_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=self.event_listbox.yview)
+        self.listbox_renderer = ListboxRenderer(self.event_listbox)
+        self.listbox_renderer.render([("   Loading calendar...", "white", "#999", None)])
 
         # Button frame
         btn_frame = tk.Frame(self.root, bg=self.bg_color)
@@ -352,8 +234,58 @@ class ScheduleApp:
         )
         ai_btn.grid(row=0, column=3, padx=5)
 
+        # Enabled once the calendar has loaded
+        self.action_buttons = [add_btn, edit_btn, del_btn, ai_btn]
+        for button in self.action_buttons:
+            button.config(state=tk.DISABLED)
+
+    def finish_startup(self):
+        """Load the calendar and the weather in the background now the window is up"""
+        self.startup.mark("first paint")
+        threading.Thread(target=self.load_in_background, daemon=True).start()
+        self.request_weather()
+
+    def load_in_background(self):
+        try:
+            core, error = ScheduleCore(self.data_file), None
+        except Exception as e:
+            core, error = None, e  # Shown by on_data_loaded, which also closes the app
+        self.startup.mark("data loaded")
+        self.run_on_ui_thread(self.on_data_loaded, core, error)
+
+    def on_data_loaded(self, core, error):
+        if core is None:
+            messagebox.showerror("Load Error", f"Could not open {self.data_file}: {error}")
+            self.root.destroy()
+            return
+
+        self.core = core
+        self.store = core.store
+        self.context_builder = core.context_builder
+        self.calendar_tools = core.calendar_tools
+        self.month_markers = MonthMarkers(self.calendar, self.store, schedule=self.root.after_idle)
+        self.on_month_changed()
         self.refresh_event_listbox()
-        self.on_date_select()  # Load weather for initial date
+        for button in self.action_buttons:
+            button.config(state=tk.NORMAL)
+        self.startup.mark("data shown")
+        self.report_startup()
+
+        if core.load_error:
+            note = " Changes won't be saved." if core.read_only else ""
+            messagebox.showerror("Load Error", f"{core.load_error}\n\nStarting with the default schedule.{note}")
+        elif core.skipped_records:
+            messagebox.showwarning(
+                "Load Warning",
+                f"{core.skipped_records} saved event(s) in {self.data_file} couldn't be read and are hidden.\n"
+                "They are kept in the file unchanged."
+            )
+
+    def report_startup(self):
+        """Write the startup timing report once both the events and the weather are showing"""
+        if self.startup and self.startup.elapsed("data shown") and self.startup.elapsed("weather shown"):
+            self.startup.write(self.startup_log)
+            self.startup = None
 
     def add_item(self):
         date = self.calendar.get_date()
@@ -361,7 +293,7 @@ class ScheduleApp:
         # Create custom dialog
         dialog = tk.Toplevel(self.root)
         dialog.title("Add Event")
-        dialog.geometry("400x380")
+        dialog.geometry("400x500")
         dialog.configure(bg="white")
         dialog.resizable(False, False)
         
@@ -402,6 +334,20 @@ class ScheduleApp:
         )
         category_combo.pack(padx=20, pady=5, fill=tk.X)
 
+        tk.Label(dialog, text="Repeats:", font=("Segoe UI", 10), bg="white").pack(anchor="w", padx=20, pady=(10, 0))
+        repeat_var = tk.StringVar(value="Never")
+        ttk.Combobox(
+            dialog,
+            textvariable=repeat_var,
+            values=["Never", "Daily", "Weekly", "Monthly"],
+            state="readonly",
+            font=("Segoe UI", 10)
+        ).pack(padx=20, pady=5, fill=tk.X)
+
+        tk.Label(dialog, text="Repeat Until (optional, e.g., 12/31/26):", font=("Segoe UI", 10), bg="white").pack(anchor="w", padx=20, pady=(10, 0))
+        until_entry = tk.Entry(dialog, font=("Segoe UI", 10), width=40)
+        until_entry.pack(padx=20, pady=5)
+
         def save_event():
             event_name = event_entry.get().strip()
             start_time = start_time_entry.get().strip()
@@ -411,14 +357,15 @@ class ScheduleApp:
             if not event_name:
                 messagebox.showwarning("Input Error", "Please enter an event name.")
                 return
+            try:
+                rule = make_rule(repeat_var.get(), date, until_entry.get().strip())
+            except ValueError as e:
+                messagebox.showwarning("Input Error", str(e))
+                return
+            if not self.confirm_no_conflicts(dialog, date, start_time, end_time):
+                return
             
-            self.schedule.append({
-                "date": date,
-                "event": event_name,
-                "start_time": start_time,
-                "end_time": end_time,
-                "category": category
-            })
+            self.store.add(date, event_name, start_time, end_time, category, rule=rule)
             self.refresh_event_listbox()
             self.save_schedule()
             dialog.destroy()
@@ -445,6 +392,16 @@ class ScheduleApp:
             messagebox.showwarning("Edit Event", "Please select an event to edit.")
             return
         event = self.listbox_index_to_event[idx]
+        target = event
+        if event.series_id is not None:
+            answer = messagebox.askyesnocancel(
+                "Edit Repeating Event",
+                "This event repeats.\n\nYes: edit every occurrence\nNo: edit only this day"
+            )
+            if answer is None:
+                return
+            if answer:
+                target = self.store.get(event.series_id)
         
         dialog = tk.Toplevel(self.root)
         dialog.title("Edit Event")
@@ -465,21 +422,21 @@ class ScheduleApp:
 
         tk.Label(dialog, text="Event Name:", font=("Segoe UI", 10), bg="white").pack(anchor="w", padx=20, pady=(10, 0))
         event_entry = tk.Entry(dialog, font=("Segoe UI", 10), width=40)
-        event_entry.insert(0, event.get("event", ""))
+        event_entry.insert(0, target.name or "")
         event_entry.pack(padx=20, pady=5)
 
         tk.Label(dialog, text="Start Time (optional):", font=("Segoe UI", 10), bg="white").pack(anchor="w", padx=20, pady=(10, 0))
         start_time_entry = tk.Entry(dialog, font=("Segoe UI", 10), width=40)
-        start_time_entry.insert(0, event.get("start_time", ""))
+        start_time_entry.insert(0, target.start_time or "")
         start_time_entry.pack(padx=20, pady=5)
 
         tk.Label(dialog, text="End Time (optional):", font=("Segoe UI", 10), bg="white").pack(anchor="w", padx=20, pady=(10, 0))
         end_time_entry = tk.Entry(dialog, font=("Segoe UI", 10), width=40)
-        end_time_entry.insert(0, event.get("end_time", ""))
+        end_time_entry.insert(0, target.end_time or "")
         end_time_entry.pack(padx=20, pady=5)
 
         tk.Label(dialog, text="Category:", font=("Segoe UI", 10), bg="white").pack(anchor="w", padx=20, pady=(10, 0))
-        category_var = tk.StringVar(value=event.get("category", "Intellectual"))
+        category_var = tk.StringVar(value=target.category or "Intellectual")
         category_combo = ttk.Combobox(
             dialog,
             textvariable=category_var,
@@ -498,11 +455,16 @@ class ScheduleApp:
             if not event_name:
                 messagebox.showwarning("Input Error", "Please enter an event name.")
                 return
+            if not self.confirm_no_conflicts(dialog, event.date, start_time, end_time, event.id):
+                return
             
-            event["event"] = event_name
-            event["start_time"] = start_time
-            event["end_time"] = end_time
-            event["category"] = category
+            self.store.update(
+                target.id,
+                name=event_name,
+                start_time=start_time,
+                end_time=end_time,
+                category=category
+            )
             self.refresh_event_listbox()
             self.save_schedule()
             dialog.destroy()
@@ -518,6 +480,24 @@ class ScheduleApp:
             pady=8
         ).pack(pady=15)
 
+    def confirm_no_conflicts(self, dialog, date, start_time, end_time, exclude_id=None):
+        """Warn if the new times overlap other events; returns True to go ahead and save"""
+        conflicts = self.core.conflicts(date, start_time, end_time, exclude_id)
+        if not conflicts:
+            return True
+        
+        lines = []
+        for other in conflicts:
+            if other.end_time:
+                lines.append(f"• {other.start_time} - {other.end_time}: {other.name}")
+            else:
+                lines.append(f"• {other.start_time}: {other.name}")
+        return messagebox.askyesno(
+            "Time Conflict",
+            "This overlaps with:\n" + "\n".join(lines) + "\n\nSave anyway?",
+            parent=dialog
+        )
+
     def delete_item(self):
         selected = self.event_listbox.curselection()
         if not selected:
@@ -530,9 +510,19 @@ class ScheduleApp:
             messagebox.showwarning("Delete Event", "Please select an event to delete.")
             return
             
-        if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this event?"):
-            event = self.listbox_index_to_event[idx]
-            self.schedule.remove(event)
+        event = self.listbox_index_to_event[idx]
+        if event.series_id is not None:
+            answer = messagebox.askyesnocancel(
+                "Delete Repeating Event",
+                "This event repeats.\n\nYes: delete every occurrence\nNo: delete only this day"
+            )
+            if answer is None:
+                return
+            self.store.remove(event.series_id if answer else event.id)
+            self.refresh_event_listbox()
+            self.save_schedule()
+        elif messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this event?"):
+            self.store.remove(event.id)
             self.refresh_event_listbox()
             self.save_schedule()
 
@@ -572,6 +562,17 @@ class ScheduleApp:
         chat_display.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
         chat_display.config(state=tk.DISABLED)
         
+        # Prompt size for the last turn
+        stats_label = tk.Label(
+            chat_window,
+            text="",
+            font=("Segoe UI", 8),
+            bg="white",
+            fg="#888",
+            anchor="w"
+        )
+        stats_label.pack(fill=tk.X, padx=10)
+        
         # Input frame
         input_frame = tk.Frame(chat_window, bg="white")
         input_frame.pack(fill=tk.X, padx=10, pady=10)
@@ -608,40 +609,27 @@ class ScheduleApp:
             chat_display.see(tk.END)
             chat_display.config(state=tk.DISABLED)
         
-        def format_schedule_for_ai():
-            """Format the schedule data for the AI to understand"""
-            schedule_text = "Current Calendar Events:\n\n"
-            
-            # Group events by date
-            events_by_date = {}
-            for event in self.schedule:
-                date = event.get("date", "")
-                if date not in events_by_date:
-                    events_by_date[date] = []
-                events_by_date[date].append(event)
-            
-            # Sort by date and format
-            for date in sorted(events_by_date.keys()):
-                schedule_text += f"Date: {date}\n"
-                for event in events_by_date[date]:
-                    event_name = event.get("event", "")
-                    start_time = event.get("start_time", "")
-                    end_time = event.get("end_time", "")
-                    category = event.get("category", "Intellectual")
-                    
-                    if start_time and end_time:
-                        schedule_text += f"  - {start_time} - {end_time}: {event_name} [{category}]\n"
-                    elif start_time:
-                        schedule_text += f"  - {start_time}: {event_name} [{category}]\n"
-                    else:
-                        schedule_text += f"  - {event_name} [{category}]\n"
-                schedule_text += "\n"
-            
-            return schedule_text
+        worker = ChatWorker(self.get_ai_client, tools=TOOLS)
+        poll_job = None
+        waiting = False
+        
+        def show_prompt_stats():
+            stats = self.prompt_stats[-1]
+            text = f"Prompt: ~{stats['prompt_tokens']:,} tokens ({stats['days_detailed']} days in full)"
+            if "input_tokens" in stats:
+                text += f" · sent {stats['input_tokens']:,} + cached {stats['cache_read_input_tokens']:,}"
+            stats_label.config(text=text)
+        
+        def set_busy(busy):
+            nonlocal waiting
+            waiting = busy
+            send_btn.config(state=tk.DISABLED if busy else tk.NORMAL)
+            stop_btn.config(state=tk.NORMAL if busy else tk.DISABLED)
         
         def send_message():
+            nonlocal poll_job
             user_message = chat_input.get().strip()
-            if not user_message:
+            if not user_message or waiting:
                 return
             
             chat_input.delete(0, tk.END)
@@ -653,86 +641,91 @@ class ScheduleApp:
                 "content": user_message
             })
             
-            try:
-                # Call Anthropic API
-                client = anthropic.Anthropic()
-                
-                # Build the system prompt with current schedule
-                schedule_data = format_schedule_for_ai()
-                system_prompt = f"""You are a helpful calendar assistant. You have access to the user's calendar.
-
-{schedule_data}
-
-Your tasks:
-1. Help users add new events to their calendar
-2. Answer questions about what events are scheduled
-3. Tell users if a day is free or busy
-4. Help find available time slots
-
-When the user wants to add an event, extract the details and respond with JSON in this EXACT format:
-{{
-    "action": "add_event",
-    "date": "M/D/YY",
-    "event": "event description",
-    "start_time": "start time (or empty string)",
-    "end_time": "end time (or empty string)",
-    "category": "Spiritual|Physical|Emotional|Intellectual"
-}}
-
-Date format must be M/D/YY (e.g., "1/15/26" for January 15, 2026).
-
-For all other questions about the calendar, respond naturally with helpful information.
-If information is missing when adding an event, ask for it in a friendly way."""
-                
-                response = client.messages.create(
-                    model="claude-sonnet-4-20250514",
-                    max_tokens=1000,
-                    system=system_prompt,
-                    messages=conversation_history
-                )
-                
-                assistant_message = response.content[0].text
-                
-                # Add to conversation history
-                conversation_history.append({
-                    "role": "assistant",
-                    "content": assistant_message
-                })
-                
-                # Try to parse JSON and add event
-                try:
-                    # Check if response contains JSON
-                    if "{" in assistant_message and "}" in assistant_message:
-                        # Extract JSON from response
-                        start = assistant_message.find("{")
-                        end = assistant_message.rfind("}") + 1
-                        json_str = assistant_message[start:end]
-                        event_data = json.loads(json_str)
-                        
-                        if event_data.get("action") == "add_event":
-                            # Add event to schedule
-                            self.schedule.append({
-                                "date": event_data["date"],
-                                "event": event_data["event"],
-                                "start_time": event_data.get("start_time", ""),
-                                "end_time": event_data.get("end_time", ""),
-                                "category": event_data.get("category", "Intellectual")
-                            })
-                            self.refresh_event_listbox()
-                            self.save_schedule()
-                            add_message("Assistant", f"✓ Event added: {event_data['event']} on {event_data['date']}")
-                        else:
-                            add_message("Assistant", assistant_message)
+            # Streamed text goes after this mark so it can be replaced once complete
+            chat_display.config(state=tk.NORMAL)
+            chat_display.insert(tk.END, "Assistant: ", "assistant_label")
+            chat_display.mark_set("reply_start", "end-1c")
+            chat_display.mark_gravity("reply_start", tk.LEFT)
+            chat_display.config(state=tk.DISABLED)
+            
+            system_prompt = self.context_builder.build(user_message)
+            self.prompt_stats.append(dict(self.context_builder.last_stats))
+            show_prompt_stats()
+            worker.start(system_prompt, conversation_history)
+            set_busy(True)
+            poll_job = chat_window.after(50, poll_reply)
+        
+        def replace_reply(text):
+            chat_display.config(state=tk.NORMAL)
+            chat_display.delete("reply_start", tk.END)
+            chat_display.insert(tk.END, f"{text}\n\n", "assistant_msg")
+            chat_display.see(tk.END)
+            chat_display.config(state=tk.DISABLED)
+        
+        def poll_reply():
+            nonlocal poll_job
+            poll_job = None
+            for kind, payload in worker.drain():
+                if kind == "delta":
+                    chat_display.config(state=tk.NORMAL)
+                    chat_display.insert(tk.END, payload, "assistant_msg")
+                    chat_display.see(tk.END)
+                    chat_display.config(state=tk.DISABLED)
+                elif kind == "tool":
+                    name, args, reply = payload
+                    reply.put(self.calendar_tools.run(name, args))
+                elif kind == "usage":
+                    self.prompt_stats[-1].update(payload)
+                    show_prompt_stats()
+                elif kind == "done":
+                    finish_reply(payload)
+                    return
+                elif kind == "cancelled":
+                    if payload:
+                        conversation_history.append({"role": "assistant", "content": payload})
+                        replace_reply(f"{payload} [stopped]")
                     else:
-                        # Normal conversation response
-                        add_message("Assistant", assistant_message)
-                        
-                except json.JSONDecodeError:
-                    # Not JSON, just a regular response
-                    add_message("Assistant", assistant_message)
-                    
+                        conversation_history.pop()
+                        replace_reply("[stopped]")
+                    set_busy(False)
+                    return
+                elif kind == "error":
+                    conversation_history.pop()
+                    replace_reply(f"Error: {str(payload)}\n\nMake sure you have set your ANTHROPIC_API_KEY environment variable.")
+                    set_busy(False)
+                    return
+            poll_job = chat_window.after(50, poll_reply)
+        
+        def finish_reply(assistant_message):
+            # Add to conversation history
+            conversation_history.append({
+                "role": "assistant",
+                "content": assistant_message
+            })
+            
+            # Try to parse JSON and add event
+            event_data = parse_add_event(assistant_message)
+            try:
+                if event_data:
+                    # Add event to schedule
+                    self.core.add_from_ai(event_data)
+                    self.refresh_event_listbox()
+                    self.save_schedule()
+                    replace_reply(f"✓ Event added: {event_data['event']} on {event_data['date']}")
+                else:
+                    # Normal conversation response
+                    replace_reply(assistant_message)
             except Exception as e:
-                add_message("Assistant", f"Error: {str(e)}\n\nMake sure you have set your ANTHROPIC_API_KEY environment variable.")
+                replace_reply(f"Error: could not add the event ({e})")
+            finally:
+                set_busy(False)
+        
+        def close_chat():
+            # Stop the in-flight request and any pending poll before the widgets go away
+            worker.cancel()
+            if poll_job is not None:
+                chat_window.after_cancel(poll_job)
+            chat_window.destroy()
         
         send_btn = tk.Button(
             input_frame,
@@ -747,162 +740,81 @@ If information is missing when adding an event, ask for it in a friendly way."""
         )
         send_btn.pack(side=tk.LEFT)
         
+        stop_btn = tk.Button(
+            input_frame,
+            text="Stop",
+            command=worker.cancel,
+            font=("Segoe UI", 10, "bold"),
+            bg="#e74c3c",
+            fg="white",
+            padx=12,
+            relief=tk.FLAT,
+            cursor="hand2",
+            state=tk.DISABLED
+        )
+        stop_btn.pack(side=tk.LEFT, padx=(5, 0))
+        
         # Bind Enter key
         chat_input.bind("<Return>", lambda e: send_message())
+        chat_window.protocol("WM_DELETE_WINDOW", close_chat)
         
         # Welcome message
         add_message("Assistant", "Hi! I'm your calendar assistant. I can help you:\n• Add new events (e.g., 'Add yoga class on January 20th from 6 PM to 7 PM')\n• Check what's scheduled (e.g., 'What do I have on January 22nd?')\n• Find free time (e.g., 'Is January 25th free?')\n• Manage your schedule\n\nWhat would you like to do?")
         
-    def get_time_block(self, time_str):
-        """Determine which time block an event belongs to"""
-        if not time_str:
-            return "All Day"
-        
-        minutes = self.parse_time_for_sorting(time_str)
-        if minutes >= 9999:  # Invalid or no time        cd C:\SCHEDULE
-            return "All Day"
-        
-        if minutes < 12 * 60:  # Before noon
-            return "Morning"
-        elif minutes < 17 * 60:  # Before 5 PM
-            return "Afternoon"
-        elif minutes < 21 * 60:  # Before 9 PM
-            return "Evening"
-        else:
-            return "Night"
-
     def refresh_event_listbox(self):
-        self.event_listbox.delete(0, tk.END)
-        self.listbox_index_to_event = {}  # Reset mapping
-        
-        # Get filtered events and sort by time
-        events = self.filtered_events()
-        sorted_events = sorted(events, key=lambda e: self.parse_time_for_sorting(e.get("start_time", "")))
-        
-        # Group events by time block
-        time_blocks = {
-            "Morning": [],
-            "Afternoon": [],
-            "Evening": [],
-            "Night": [],
-            "All Day": []
-        }
-        
-        for event in sorted_events:
-            block = self.get_time_block(event.get("start_time", ""))
-            time_blocks[block].append(event)
-        
-        # Display events by time block with headers
-        block_order = ["Morning", "Afternoon", "Evening", "Night", "All Day"]
-        block_emojis = {
-            "Morning": "🌅",
-            "Afternoon": "☀️",
-            "Evening": "🌆",
-            "Night": "🌙",
-            "All Day": "📅"
-        }
-        
-        for block_name in block_order:
-            if time_blocks[block_name]:
-                # Add time block header
-                header = f"{block_emojis[block_name]} {block_name}"
-                self.event_listbox.insert(tk.END, header)
-                header_idx = self.event_listbox.size() - 1
-                self.event_listbox.itemconfig(header_idx, bg="#34495e", fg="white")
-                
-                # Add events in this time block
-                for event in time_blocks[block_name]:
-                    event_name = event.get("event", "")
-                    start_time = event.get("start_time", "")
-                    end_time = event.get("end_time", "")
-                    
-                    # Build display text based on available time information
-                    if start_time and end_time:
-                        display_text = f"   🕐 {start_time} - {end_time} — {event_name}"
-                    elif start_time:
-                        display_text = f"   🕐 {start_time} — {event_name}"
-                    else:
-                        display_text = f"   {event_name}"
-                    
-                    self.event_listbox.insert(tk.END, display_text)
-                    
-                    # Color code by category
-                    category = event.get("category", "Intellectual")
-                    colors = CATEGORY_COLORS.get(category, CATEGORY_COLORS["Intellectual"])
-                    idx = self.event_listbox.size() - 1
-                    self.event_listbox.itemconfig(idx, bg=colors["bg"], fg=colors["fg"])
-                    
-                    # NEW: Store mapping from listbox index to event
-                    self.listbox_index_to_event[idx] = event
+        if self.core is None:
+            return  # Still loading
+        # Rows come from the per-event cache; only rows that differ from what's shown are redrawn
+        rows = self.core.row_cache.model(self.filtered_events())
+        self.listbox_index_to_event = self.listbox_renderer.render(rows)
+
+    def on_month_changed(self, event=None):
+        if self.month_markers is None:
+            return
+        month, year = self.calendar.get_displayed_month()
+        self.month_markers.show_month(year, month)
 
     def on_date_select(self, event=None):
         self.refresh_event_listbox()
-        # Update weather display
+        self.request_weather()
+
+    def request_weather(self):
+        # Update weather display (fetched in the background)
         selected_date = self.calendar.get_date()
-        weather_info = self.get_weather_for_date(selected_date)
-        self.weather_display.config(text=weather_info)
+        self.weather_display.config(text="Loading weather...")
+        self.weather.request(selected_date, lambda text: self.show_weather(selected_date, text))
+
+    def show_weather(self, date_str, weather_info):
+        # Ignore results for a date the user has already clicked away from
+        if self.calendar.get_date() == date_str:
+            self.weather_display.config(text=weather_info)
+        if self.startup:
+            self.startup.mark("weather shown")
+            self.report_startup()
 
     def filtered_events(self):
-        selected_date = self.calendar.get_date()
-        return [e for e in self.schedule if e["date"] == selected_date]
+        return self.store.events_on(self.calendar.get_date())
 
-    def load_course_schedule(self):
-        # Try to load saved data first
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    return json.load(f)
-            except:
-                pass
-        
-        # If no saved data, return default schedule with new categories
-        return [
-            {"date": "1/19/26", "event": "Study Session - Problem Set Prep", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "1/26/26", "event": "Group Study Meeting", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "1/26/26", "event": "Research Project Work", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "2/2/26", "event": "Exam Preparation", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "2/2/26", "event": "Tutorial Session", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "2/2/26", "event": "Online Course Review", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "2/9/26", "event": "Case Study Analysis", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "2/9/26", "event": "Research Documentation", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "2/9/26", "event": "Learning Module", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "2/16/26", "event": "Advanced Study", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "2/16/26", "event": "Project Collaboration", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "2/23/26", "event": "Final Exam Prep", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "2/24/26", "event": "Team Presentation", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "3/2/26", "event": "Assessment Review", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "3/2/26", "event": "Project Evaluation", "start_time": "", "end_time": "", "category": "Intellectual"},
-            {"date": "1/13/26", "event": "Morning Meditation", "start_time": "6:00 AM", "end_time": "6:30 AM", "category": "Spiritual"},
-            {"date": "1/15/26", "event": "Yoga Class", "start_time": "7:00 AM", "end_time": "8:00 AM", "category": "Physical"},
-            {"date": "1/20/26", "event": "Journaling Session", "start_time": "8:00 PM", "end_time": "8:30 PM", "category": "Emotional"},
-            {"date": "1/22/26", "event": "Fitness Training", "start_time": "5:30 PM", "end_time": "6:30 PM", "category": "Physical"},
-            {"date": "1/27/26", "event": "Counseling Session", "start_time": "3:00 PM", "end_time": "4:00 PM", "category": "Emotional"},
-            {"date": "1/29/26", "event": "Prayer Time", "start_time": "7:00 PM", "end_time": "7:30 PM", "category": "Spiritual"},
-            {"date": "2/3/26", "event": "Exercise Class", "start_time": "6:00 PM", "end_time": "7:00 PM", "category": "Physical"},
-            {"date": "2/5/26", "event": "Mindfulness Retreat", "start_time": "9:00 AM", "end_time": "5:00 PM", "category": "Spiritual"},
-            {"date": "2/10/26", "event": "Running Session", "start_time": "6:00 AM", "end_time": "7:00 AM", "category": "Physical"},
-            {"date": "2/12/26", "event": "Wellness Workshop", "start_time": "2:00 PM", "end_time": "4:00 PM", "category": "Emotional"},
-            {"date": "2/17/26", "event": "Team Sports", "start_time": "4:00 PM", "end_time": "6:00 PM", "category": "Physical"},
-            {"date": "2/19/26", "event": "Spiritual Book Club", "start_time": "7:00 PM", "end_time": "8:30 PM", "category": "Spiritual"},
-            {"date": "2/24/26", "event": "Reflection Time", "start_time": "9:00 PM", "end_time": "9:30 PM", "category": "Emotional"},
-            {"date": "2/26/26", "event": "Community Meditation", "start_time": "10:00 AM", "end_time": "11:00 AM", "category": "Spiritual"},
-        ]
-    
     def save_schedule(self):
-        """Save schedule to JSON file"""
-        try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.schedule, f, indent=2)
-        except Exception as e:
-            messagebox.showerror("Save Error", f"Could not save data: {str(e)}")
+        """Report any failed save (each change is journaled as it happens)"""
+        error = self.core.take_save_error() if self.core else None
+        if error:
+            messagebox.showerror("Save Error", f"Could not save data: {str(error)}")
     
     def on_closing(self):
         """Handle window close event"""
+        if self.core:
+            self.core.close()
+        self.weather.close()
         self.save_schedule()
         self.root.destroy()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Life Wellness Calendar")
+    parser.add_argument("--startup-log", help="append startup timings to this file (JSON lines)")
+    args, _ = parser.parse_known_args()
+
     root = tk.Tk()
     root.configure(bg="#f5f5f5")
-    app = ScheduleApp(root)
+    app = ScheduleApp(root, startup_log=args.startup_log)
     root.mainloop()
\ No newline at end of file
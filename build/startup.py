@@ -0,0 +1,53 @@
+"""
+Startup timing for the Life Wellness Calendar.
+The app marks each phase of a cold start (imports, window, first paint,
+data load, weather) and reports the timeline once everything is on screen.
+Set STARTUP_LOG (in the environment or .env) or pass --startup-log PATH to
+append the report to a file as one JSON line per launch.
+"""
+import json
+import sys
+import time
+from datetime import datetime
+
+
+class StartupTimer:
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.marks = []  # (phase, seconds since start); phases may be marked from worker threads
+
+    def mark(self, phase):
+        self.marks.append((phase, time.perf_counter() - self.started))
+
+    def elapsed(self, phase):
+        """Seconds from start to phase, or None if it hasn't happened"""
+        for name, seconds in self.marks:
+            if name == phase:
+                return seconds
+        return None
+
+    def report(self):
+        """Timeline text: each phase with its own duration and the running total"""
+        lines = ["⏱️ Startup timing:"]
+        previous = 0.0
+        for phase, seconds in sorted(self.marks, key=lambda mark: mark[1]):
+            lines.append(f"   {phase:<20} +{(seconds - previous) * 1000:7.1f} ms   ({seconds * 1000:7.1f} ms)")
+            previous = seconds
+        return "\n".join(lines)
+
+    def to_dict(self):
+        return {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "phases_ms": {phase: round(seconds * 1000, 1) for phase, seconds in self.marks}
+        }
+
+    def write(self, log_path=None):
+        """Print the report (when there's a console) and append it to log_path if given"""
+        if sys.stderr is not None:  # None in the windowed PyInstaller build
+            print(self.report(), file=sys.stderr)
+        if log_path:
+            try:
+                with open(log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(self.to_dict()) + "\n")
+            except OSError:
+                pass  # Timing is best effort; never block startup on it
@@ -0,0 +1,206 @@
+"""
+Crash-safe persistence for the Life Wellness Calendar.
+
+calendar_data.json holds a snapshot of every event. Each add/edit/delete is
+appended as one JSON line to calendar_data.json.journal instead of rewriting
+the snapshot. When the journal grows past a threshold it is rotated into a
+numbered segment and a background thread writes a fresh snapshot (temp file +
+os.replace, so the snapshot is never half-written), then deletes the segments
+it covered. Journal records are idempotent, so replaying a segment that did
+make it into the snapshot is harmless.
+"""
+import glob
+import json
+import os
+import shutil
+import threading
+
+from event_store import EventStore
+
+
+class StorageError(Exception):
+    """Raised when the saved calendar can't be read"""
+
+
+class JournalStorage:
+    def __init__(self, snapshot_path, compact_after=500):
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + ".journal"
+        self.compact_after = compact_after
+        self._journal = None
+        self._journal_records = 0
+        self._segment = 0
+        self._lock = threading.Lock()
+        self._compact_thread = None
+        self._error = None
+
+    # ---- Loading ----
+
+    def load(self, migrate=True, set_aside=True):
+        """Read the snapshot and replay the journal; returns None if nothing is saved yet
+
+        An unparseable snapshot raises StorageError; with set_aside it and its
+        journal are first moved out of the way (see _set_aside).
+        """
+        if not os.path.exists(self.snapshot_path):
+            return None
+
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            if not isinstance(records, list):
+                raise ValueError("expected a list of events")
+        except ValueError as e:
+            if set_aside:
+                self._set_aside(e)
+            raise StorageError(f"Could not read {self.snapshot_path}: {e}") from e
+
+        # Records that aren't valid events are skipped here and written back as they are
+        legacy = any(isinstance(record, dict) and "id" not in record for record in records)
+        store = EventStore.from_dicts(records)
+
+        for path in self._segments() + [self.journal_path]:
+            self._journal_records += self._replay(store, path)
+        store.version = 0
+
+        if legacy and migrate:
+            self._migrate(store)
+        return store
+
+    def _set_aside(self, error):
+        """Move the unreadable snapshot and its journal out of the way, then raise StorageError
+
+        The journal only makes sense on top of its own snapshot, so it must not
+        be replayed onto whatever calendar the app starts with instead.
+        """
+        kept_as = self.snapshot_path + ".corrupt"
+        for path in [self.snapshot_path, self.journal_path] + self._segments():
+            if os.path.exists(path):
+                try:
+                    os.replace(path, path + ".corrupt")
+                except OSError:
+                    kept_as = self.snapshot_path
+        raise StorageError(f"Could not read {self.snapshot_path}: {error}\nThe file was kept as {kept_as}.")
+
+    def _replay(self, store, path):
+        if not os.path.exists(path):
+            return 0
+        count = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if record.get("op") == "put":
+                        store.put_dict(record["event"])
+                    elif record.get("op") == "del" and store.get(record.get("id")):
+                        store.remove(record["id"])
+                except (ValueError, TypeError, KeyError, AttributeError):
+                    continue  # Torn write from a crash, or a bad record; the rest of the log is still good
+                count += 1
+        return count
+
+    def _migrate(self, store):
+        """One-shot upgrade of a pre-journal calendar_data.json: keep a backup, add ids"""
+        backup = self.snapshot_path + ".bak"
+        if not os.path.exists(backup):
+            shutil.copy2(self.snapshot_path, backup)
+        self._write_snapshot(store.to_dicts())
+
+    # ---- Writing ----
+
+    def attach(self, store):
+        """Start journaling every change made to store"""
+        if not os.path.exists(self.snapshot_path):
+            self._write_snapshot(store.to_dicts())
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+        store.subscribe(lambda op, event, *previous: self._on_change(store, op, event))
+        if self._journal_records >= self.compact_after:
+            self.compact(store)
+
+    def _on_change(self, store, op, event):
+        if op == "put":
+            record = {"op": "put", "event": event.to_dict()}
+        else:
+            record = {"op": "del", "id": event.id}
+        try:
+            with self._lock:
+                self._journal.write(json.dumps(record) + "\n")
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+        except OSError as e:
+            self._error = e
+            return
+
+        self._journal_records += 1
+        if self._journal_records >= self.compact_after:
+            self.compact(store)
+
+    def compact(self, store, wait=False):
+        """Fold the journal into a new snapshot on a background thread"""
+        if self._compact_thread and self._compact_thread.is_alive():
+            if not wait:
+                return
+            self._compact_thread.join()
+
+        with self._lock:
+            records = store.to_dicts()
+            self._journal.close()
+            self._segment = max([self._segment_number(p) for p in self._segments()] + [self._segment]) + 1
+            segment_path = f"{self.journal_path}.{self._segment}"
+            os.replace(self.journal_path, segment_path)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+            self._journal_records = 0
+
+        covered = [p for p in self._segments() if self._segment_number(p) <= self._segment]
+        self._compact_thread = threading.Thread(
+            target=self._compact_worker, args=(records, covered), daemon=True
+        )
+        self._compact_thread.start()
+        if wait:
+            self._compact_thread.join()
+
+    def _compact_worker(self, records, covered):
+        try:
+            self._write_snapshot(records)
+            for path in covered:
+                os.remove(path)
+        except OSError as e:
+            self._error = e
+
+    def _write_snapshot(self, records):
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(records, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+    def rewrite(self, records):
+        """Replace everything saved with records (for offline tools; the app must be closed)"""
+        self._write_snapshot(records)
+        for path in self._segments() + [self.journal_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def take_error(self):
+        """Return (and clear) the last write error, if any"""
+        error, self._error = self._error, None
+        return error
+
+    def close(self):
+        if self._compact_thread:
+            self._compact_thread.join()
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+
+    # ---- Journal segments ----
+
+    def _segments(self):
+        paths = [p for p in glob.glob(glob.escape(self.journal_path) + ".*")
+                 if p.rsplit(".", 1)[1].isdigit()]
+        return sorted(paths, key=self._segment_number)
+
+    @staticmethod
+    def _segment_number(path):
+        return int(path.rsplit(".", 1)[1])
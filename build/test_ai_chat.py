@@ -0,0 +1,189 @@
+"""
+Tests for ai_chat.py with a fake streaming Anthropic client.
+Run with: python -m pytest test_ai_chat.py (or python -m unittest test_ai_chat)
+"""
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from ai_chat import ChatWorker, parse_add_event
+
+
+class FakeStream:
+    def __init__(self, chunks, final):
+        self.chunks = chunks
+        self.final = final
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self):
+        for chunk in self.chunks:
+            if callable(chunk):
+                chunk()  # A hook, e.g. waiting for the test to cancel
+            else:
+                yield chunk
+
+    def get_final_message(self):
+        return self.final
+
+
+class FakeClient:
+    """Plays back one scripted (chunks, stop_reason, content) turn per stream() call"""
+
+    def __init__(self, turns):
+        self.turns = list(turns)
+        self.requests = []
+        self.messages = SimpleNamespace(stream=self._stream)
+
+    def _stream(self, **request):
+        self.requests.append(request)
+        chunks, stop_reason, content = self.turns.pop(0)
+        usage = SimpleNamespace(input_tokens=10, output_tokens=5,
+                                cache_creation_input_tokens=0, cache_read_input_tokens=7)
+        return FakeStream(chunks, SimpleNamespace(stop_reason=stop_reason, content=content, usage=usage))
+
+
+def tool_use(block_id, name, args):
+    return SimpleNamespace(type="tool_use", id=block_id, name=name, input=args)
+
+
+def collect(worker, on_tool=None, timeout=5):
+    """Drain worker messages until the request finishes; returns [(kind, payload), ...]"""
+    seen = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for kind, payload in worker.drain():
+            seen.append((kind, payload))
+            if kind == "tool" and on_tool:
+                on_tool(*payload)
+            if kind in ("done", "cancelled", "error"):
+                return seen
+        time.sleep(0.01)
+    raise AssertionError(f"worker never finished; got {seen}")
+
+
+class ChatWorkerTest(unittest.TestCase):
+    def test_deltas_arrive_in_order(self):
+        client = FakeClient([(["Hel", "lo", " there"], "end_turn", [])])
+        worker = ChatWorker(lambda: client)
+        worker.start([{"type": "text", "text": "system"}], [{"role": "user", "content": "hi"}])
+        seen = collect(worker)
+
+        self.assertEqual([p for k, p in seen if k == "delta"], ["Hel", "lo", " there"])
+        self.assertEqual(seen[-1], ("done", "Hello there"))
+        usage = dict(seen)["usage"]
+        self.assertEqual((usage["input_tokens"], usage["cache_read_input_tokens"]), (10, 7))
+        self.assertEqual(client.requests[0]["messages"], [{"role": "user", "content": "hi"}])
+
+    def test_tool_use_continues_through_reply_queue(self):
+        call = tool_use("toolu_1", "get_events", {"start_date": "1/20/26", "end_date": "1/20/26"})
+        client = FakeClient([
+            (["Let me check."], "tool_use", [call]),
+            (["You're free."], "end_turn", [])
+        ])
+        worker = ChatWorker(lambda: client, tools=[{"name": "get_events"}])
+        worker.start([], [{"role": "user", "content": "Am I free on 1/20?"}])
+        calls = []
+
+        def on_tool(name, args, reply):
+            calls.append((name, args))
+            reply.put('{"events": []}')
+
+        seen = collect(worker, on_tool)
+        self.assertEqual(calls, [("get_events", {"start_date": "1/20/26", "end_date": "1/20/26"})])
+        self.assertEqual(seen[-1], ("done", "Let me check.\n\nYou're free."))
+        self.assertEqual(dict(seen)["usage"]["input_tokens"], 20)  # Summed over both turns
+
+        followup = client.requests[1]["messages"]
+        self.assertEqual(followup[1], {"role": "assistant", "content": [call]})
+        self.assertEqual(followup[2]["content"], [
+            {"type": "tool_result", "tool_use_id": "toolu_1", "content": '{"events": []}'}
+        ])
+        self.assertEqual(client.requests[1]["tools"], [{"name": "get_events"}])
+
+    def test_tool_rounds_are_capped(self):
+        call = tool_use("toolu_1", "busy_summary", {})
+        client = FakeClient([(["."], "tool_use", [call])] * 4)
+        worker = ChatWorker(lambda: client, tools=[{"name": "busy_summary"}], max_tool_rounds=2)
+        worker.start([], [{"role": "user", "content": "How busy am I?"}])
+
+        tools_run = []
+        seen = collect(worker, on_tool=lambda name, args, reply: (tools_run.append(name), reply.put("{}")))
+        self.assertEqual(seen[-1][0], "done")
+        self.assertEqual(len(tools_run), 2)
+        self.assertEqual(len(client.requests), 3)
+        self.assertNotIn("tool_choice", client.requests[1])
+        self.assertEqual(client.requests[2]["tool_choice"], {"type": "none"})
+
+    def test_cancel_during_stream(self):
+        gate = threading.Event()
+        client = FakeClient([(["Partial", gate.wait, " never shown"], "end_turn", [])])
+        worker = ChatWorker(lambda: client)
+        worker.start([], [{"role": "user", "content": "hi"}])
+
+        deadline = time.monotonic() + 5
+        seen = []
+        while not any(kind == "delta" for kind, _ in seen) and time.monotonic() < deadline:
+            seen.extend(worker.drain())
+            time.sleep(0.01)
+        worker.cancel()
+        gate.set()
+        seen.extend(collect(worker))
+
+        self.assertEqual(seen[-1], ("cancelled", "Partial"))
+        self.assertNotIn(("delta", " never shown"), seen)
+        self.assertFalse(any(kind == "done" for kind, _ in seen))
+
+    def test_cancel_during_pending_tool_call(self):
+        client = FakeClient([
+            (["Checking."], "tool_use", [tool_use("toolu_1", "busy_summary", {})]),
+            (["Unreachable"], "end_turn", [])
+        ])
+        worker = ChatWorker(lambda: client)
+        worker.start([], [{"role": "user", "content": "How busy am I?"}])
+
+        # Never answer the tool; cancel while the worker waits for it
+        seen = collect(worker, on_tool=lambda name, args, reply: worker.cancel())
+        self.assertEqual(seen[-1], ("cancelled", "Checking."))
+        self.assertEqual(len(client.requests), 1)
+
+    def test_error_is_reported(self):
+        def broken_client():
+            raise RuntimeError("no API key")
+
+        worker = ChatWorker(broken_client)
+        worker.start([], [{"role": "user", "content": "hi"}])
+        kind, payload = collect(worker)[-1]
+        self.assertEqual(kind, "error")
+        self.assertIn("no API key", str(payload))
+
+
+class ParseAddEventTest(unittest.TestCase):
+    def test_json_split_across_stream_chunks(self):
+        chunks = ['Sure! {"action": "add_', 'event", "date": "1/20/26", ', '"event": "Yoga", "start_time": "6:00 PM"', '}']
+        client = FakeClient([(chunks, "end_turn", [])])
+        worker = ChatWorker(lambda: client)
+        worker.start([], [{"role": "user", "content": "Add yoga on 1/20 at 6"}])
+        kind, text = collect(worker)[-1]
+
+        self.assertEqual(kind, "done")
+        self.assertEqual(parse_add_event(text), {
+            "action": "add_event", "date": "1/20/26", "event": "Yoga", "start_time": "6:00 PM"
+        })
+
+    def test_plain_text_and_incomplete_events(self):
+        self.assertIsNone(parse_add_event("You have nothing on Tuesday."))
+        self.assertIsNone(parse_add_event('{"action": "something_else", "date": "1/20/26"}'))
+        self.assertIsNone(parse_add_event('{"action": "add_event", "event": "No date"}'))
+        self.assertIsNone(parse_add_event('{"action": "add_event", "date": "1/20/26", "event": ""}'))
+        self.assertIsNone(parse_add_event('{"action": "add_event", "date": 12, "event": "Yoga"}'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+"""
+Tests for recurrence.py, repeating events in the store and migrate_recurring.py.
+Run with: python -m pytest test_recurrence.py (or python -m unittest test_recurrence)
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+import migrate_recurring
+from core import make_rule
+from event_store import EventStore, format_date, parse_date
+from recurrence import Recurrence
+
+
+def brute_force(rule, start, lo, hi):
+    """Occurrences by checking every day from the start, for comparison with Recurrence.between"""
+    first = date.fromordinal(start)
+    found = []
+    n = 0
+    for ordinal in range(start, hi + 1):
+        d = date.fromordinal(ordinal)
+        if rule.freq == "daily":
+            hit = (ordinal - start) % rule.interval == 0
+        elif rule.freq == "weekly":
+            weeks = (ordinal - d.weekday() - (start - first.weekday())) // 7
+            hit = d.weekday() in rule.weekdays and weeks % rule.interval == 0
+        else:
+            months = (d.year - first.year) * 12 + d.month - first.month
+            hit = d.day == first.day and months % rule.interval == 0
+        if not hit:
+            continue
+        n += 1
+        if (rule.until is not None and ordinal > rule.until) or (rule.count and n > rule.count):
+            break
+        if ordinal >= lo and ordinal not in rule.exdates:
+            found.append(ordinal)
+    return found
+
+
+class RecurrenceTest(unittest.TestCase):
+    def test_matches_brute_force_expansion(self):
+        start = date(2026, 1, 31).toordinal()
+        rules = [
+            Recurrence("daily"),
+            Recurrence("daily", interval=3, count=10),
+            Recurrence("weekly", weekdays=[0, 2, 4]),
+            Recurrence("weekly", interval=2, weekdays=[1, 5], until=start + 60),
+            Recurrence("monthly"),  # Skips months without a 31st
+            Recurrence("monthly", interval=2, count=4),
+            Recurrence("daily", exdates={start + 1, start + 5})
+        ]
+        for rule in rules:
+            rule.bind(start)
+            for lo, hi in [(start, start + 400), (start + 17, start + 45), (start - 10, start + 3)]:
+                with self.subTest(rule=rule.to_dict(format_date), lo=lo - start, hi=hi - start):
+                    self.assertEqual(rule.between(start, lo, hi), brute_force(rule, start, lo, hi))
+
+    def test_dict_round_trip(self):
+        start = parse_date("1/5/26")
+        rule = Recurrence("weekly", interval=2, weekdays=[0, 3], until=parse_date("6/1/26"),
+                          exdates={parse_date("1/19/26")},
+                          overrides={parse_date("1/22/26"): {"start_time": "7:00 AM"}}).bind(start)
+        data = rule.to_dict(format_date)
+        self.assertEqual(data, {
+            "freq": "weekly", "interval": 2, "byday": ["MO", "TH"], "until": "6/1/26",
+            "exdates": ["1/19/26"], "overrides": {"1/22/26": {"start_time": "7:00 AM"}}
+        })
+        copy = Recurrence.from_dict(json.loads(json.dumps(data)), parse_date).bind(start)
+        self.assertEqual(copy.between(start, start, start + 200), rule.between(start, start, start + 200))
+
+        data["overrides"]["1/22/26"]["start_time"] = "changed"
+        self.assertEqual(rule.overrides[parse_date("1/22/26")], {"start_time": "7:00 AM"})
+
+    def test_make_rule_rejects_until_before_start(self):
+        self.assertIsNone(make_rule("Never", "1/20/26", "1/1/26"))
+        self.assertEqual(make_rule("Daily", "1/20/26", "1/20/26").until, parse_date("1/20/26"))
+        with self.assertRaises(ValueError):
+            make_rule("Daily", "1/20/26", "1/1/26")
+
+
+class SeriesInStoreTest(unittest.TestCase):
+    def test_occurrence_edits_survive_a_round_trip(self):
+        store = EventStore()
+        series = store.add("1/5/26", "Gym", "6:00 AM", "7:00 AM", "Physical", rule=Recurrence("daily"))
+        store.update((series.id, parse_date("1/6/26")), start_time="8:00 AM", category="Emotional")
+        store.remove((series.id, parse_date("1/7/26")))
+
+        reloaded = EventStore.from_dicts(json.loads(json.dumps(store.to_dicts())))
+        days = {d: reloaded.events_on(d) for d in ("1/5/26", "1/6/26", "1/7/26", "1/8/26")}
+        self.assertEqual(days["1/5/26"][0].start_time, "6:00 AM")
+        self.assertEqual((days["1/6/26"][0].start_time, days["1/6/26"][0].category), ("8:00 AM", "Emotional"))
+        self.assertEqual(days["1/7/26"], [])
+        self.assertEqual(days["1/8/26"][0].id, (series.id, parse_date("1/8/26")))
+
+    def test_moving_an_occurrence_makes_a_one_off(self):
+        store = EventStore()
+        series = store.add("1/5/26", "Gym", rule=Recurrence("daily"))
+        moved = store.update((series.id, parse_date("1/6/26")), date="1/10/26")
+        self.assertIsNone(moved.series_id)
+        self.assertEqual(store.events_on("1/6/26"), [])
+        self.assertEqual([e.id for e in store.events_on("1/10/26")],
+                         [moved.id, (series.id, parse_date("1/10/26"))])  # One-offs come first
+
+
+class MigrateRecurringTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "calendar_data.json")
+        start = date(2026, 1, 5)
+        self.records = [
+            {"id": n + 1, "date": format_date((start + timedelta(days=n)).toordinal()), "event": "Rosary",
+             "start_time": "11:00 AM" if n != 3 else "9:00 AM", "end_time": "", "category": "Spiritual"}
+            for n in range(10) if n != 6
+        ]
+        self.records.append({"id": 50, "date": "1/8/26", "event": "Dentist"})
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.records, f, indent=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def run_main(self, *args):
+        with mock.patch("builtins.print"):
+            return migrate_recurring.main([self.path, *args])
+
+    def saved(self):
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_folds_a_daily_run(self):
+        new_records, created = migrate_recurring.find_series(self.records)
+        self.assertEqual(len(created), 1)
+        series, folded = created[0]
+        self.assertEqual(folded, 9)
+        self.assertEqual(series["rrule"], {
+            "freq": "daily", "until": "1/14/26", "exdates": ["1/11/26"],
+            "overrides": {"1/8/26": {"start_time": "9:00 AM"}}
+        })
+        self.assertEqual([r["event"] for r in new_records], ["Rosary", "Dentist"])
+        self.assertEqual(migrate_recurring._expanded(new_records), migrate_recurring._expanded(self.records))
+
+    def test_writes_with_backup(self):
+        self.assertEqual(self.run_main(), 0)
+        self.assertEqual(len(self.saved()), 2)
+        with open(self.path + ".bak", encoding="utf-8") as f:
+            self.assertEqual(json.load(f), self.records)
+
+    def test_dry_run_writes_nothing(self):
+        with open(self.path, "rb") as f:
+            before = f.read()
+        self.assertEqual(self.run_main("--dry-run"), 0)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual(os.listdir(self.dir), ["calendar_data.json"])
+
+    def test_refuses_to_write_when_expansion_differs(self):
+        find_series = migrate_recurring.find_series
+
+        def lossy(records, min_occurrences):
+            new_records, created = find_series(records, min_occurrences)
+            return new_records[:-1], created  # Drops the Dentist
+
+        with mock.patch.object(migrate_recurring, "find_series", lossy):
+            self.assertEqual(self.run_main(), 1)
+        self.assertEqual(len(self.saved()), len(self.records))
+        self.assertFalse(os.path.exists(self.path + ".journal"))
+
+    def test_unreadable_file_is_left_in_place(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("garbage")
+        self.assertEqual(self.run_main("--dry-run"), 1)
+        self.assertEqual(self.run_main(), 1)
+        self.assertEqual(os.listdir(self.dir), ["calendar_data.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+Tests for storage.py: journal replay, compaction and loading saved files.
+Run with: python -m pytest test_storage.py (or python -m unittest test_storage)
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from event_store import EventStore
+from storage import JournalStorage, StorageError
+
+
+def names(store):
+    return sorted(event.name for event in store)
+
+
+class JournalStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "calendar_data.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write_snapshot(self, records, **dump_args):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(records, f, **dump_args)
+
+    def open_store(self, records=()):
+        """A journaled store: loaded from disk, or started from records"""
+        storage = JournalStorage(self.path)
+        store = storage.load() or EventStore.from_dicts(records)
+        storage.attach(store)
+        return storage, store
+
+    def reload(self):
+        storage = JournalStorage(self.path)
+        store = storage.load()
+        storage.close()
+        return store
+
+    def test_edits_replay_from_the_journal(self):
+        storage, store = self.open_store([{"date": "1/5/26", "event": "Yoga"}])
+        store.add("1/6/26", "Run", "6:00 AM", "7:00 AM", "Physical")
+        yoga = next(event for event in store if event.name == "Yoga")
+        store.update(yoga.id, name="Hot Yoga")
+        storage.close()
+
+        self.assertTrue(os.path.getsize(self.path + ".journal") > 0)
+        reloaded = self.reload()
+        self.assertEqual(names(reloaded), ["Hot Yoga", "Run"])
+        self.assertEqual(reloaded.events_on("1/6/26")[0].start_time, "6:00 AM")
+
+    def test_torn_last_line_is_ignored(self):
+        storage, store = self.open_store([{"date": "1/5/26", "event": "Yoga"}])
+        store.add("1/6/26", "Run")
+        storage.close()
+        with open(self.path + ".journal", "a", encoding="utf-8") as f:
+            f.write('{"op": "put", "event": {"id": 9, "date": "1/7')  # Crash mid-write
+
+        self.assertEqual(names(self.reload()), ["Run", "Yoga"])
+
+    def test_leftover_segment_is_replayed(self):
+        storage, store = self.open_store([{"date": "1/5/26", "event": "Yoga"}])
+        store.add("1/6/26", "Run")
+        storage.close()
+        # Crash after the journal was rotated but before the new snapshot was written
+        os.replace(self.path + ".journal", self.path + ".journal.1")
+
+        self.assertEqual(names(self.reload()), ["Run", "Yoga"])
+
+    def test_segment_already_in_snapshot_replays_harmlessly(self):
+        storage, store = self.open_store([{"date": "1/5/26", "event": "Yoga"}])
+        run = store.add("1/6/26", "Run")
+        store.update(run.id, name="Long Run")
+        shutil.copy(self.path + ".journal", os.path.join(self.dir, "segment"))
+        storage.compact(store, wait=True)
+        store.add("1/7/26", "Swim")
+        storage.close()
+
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(sorted(r["event"] for r in json.load(f)), ["Long Run", "Yoga"])
+        self.assertEqual([p for p in os.listdir(self.dir) if ".journal." in p], [])
+
+        # Crash after the snapshot was written but before the segment was deleted
+        shutil.copy(os.path.join(self.dir, "segment"), self.path + ".journal.1")
+        self.assertEqual(names(self.reload()), ["Long Run", "Swim", "Yoga"])
+
+    def test_compaction_threshold(self):
+        storage = JournalStorage(self.path, compact_after=3)
+        store = EventStore()
+        storage.attach(store)
+        for day in range(1, 8):
+            store.add(f"1/{day}/26", f"Event {day}")
+        storage.close()
+
+        with open(self.path + ".journal", encoding="utf-8") as f:
+            self.assertLess(len(f.readlines()), 3)
+        self.assertEqual(len(self.reload()), 7)
+
+    def test_legacy_file_is_migrated_with_backup(self):
+        legacy = [{"date": "1/5/26", "event": "Yoga"}, {"date": "1/6/26", "event": "Run"}]
+        self.write_snapshot(legacy, indent=2)
+        with open(self.path, "rb") as f:
+            original = f.read()
+
+        store = self.reload()
+        with open(self.path + ".bak", "rb") as f:
+            self.assertEqual(f.read(), original)
+        with open(self.path, encoding="utf-8") as f:
+            saved = json.load(f)
+        self.assertEqual([r["id"] for r in saved], [event.id for event in store])
+        self.assertEqual([r["event"] for r in saved], ["Yoga", "Run"])
+
+    def test_unreadable_records_are_kept(self):
+        bad = [{"id": 7, "date": "1/5/26", "event": "Odd", "rrule": {"freq": "yearly"}}, 5]
+        self.write_snapshot([{"id": 1, "date": "1/5/26", "event": "Yoga"}] + bad)
+
+        storage, store = self.open_store()
+        self.assertEqual(names(store), ["Yoga"])
+        self.assertEqual(store.unreadable, bad)
+        self.assertEqual(store.add("1/6/26", "Run").id, 8)  # The unreadable record's id stays taken
+        storage.compact(store, wait=True)
+        storage.close()
+
+        with open(self.path, encoding="utf-8") as f:
+            saved = json.load(f)
+        self.assertEqual([r for r in saved if r in bad], bad)
+
+    def test_unparseable_snapshot_is_set_aside_with_its_journal(self):
+        self.write_snapshot([{"id": 1, "date": "1/5/26", "event": "Yoga"}])
+        with open(self.path + ".journal", "w", encoding="utf-8") as f:
+            f.write('{"op": "del", "id": 1}\n')
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("garbage")
+
+        with self.assertRaises(StorageError):
+            JournalStorage(self.path).load(set_aside=False)
+        self.assertTrue(os.path.exists(self.path))
+
+        with self.assertRaises(StorageError):
+            JournalStorage(self.path).load()
+        self.assertEqual(sorted(os.listdir(self.dir)),
+                         ["calendar_data.json.corrupt", "calendar_data.json.journal.corrupt"])
+        self.assertIsNone(JournalStorage(self.path).load())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Tests for weather.py against a local stub of the OpenWeather API.
+Run with: python -m pytest test_weather.py (or python -m unittest test_weather)
+"""
+import json
+import threading
+import time
+import unittest
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from weather import WeatherService, parse_forecast
+
+
+def forecast_entry(day, hour, temp, description="clear sky"):
+    return {
+        "dt_txt": f"{day.isoformat()} {hour:02d}:00:00",
+        "main": {"temp": temp, "feels_like": temp - 2, "humidity": 50},
+        "weather": [{"description": description}],
+        "wind": {"speed": 4.0}
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        kind = self.path.split("?")[0].rsplit("/", 1)[-1]
+        with server.lock:
+            server.gets.append(kind)
+        time.sleep(server.delay)  # Long enough for repeated requests to overlap
+        body = json.dumps(server.payloads[kind]).encode("utf-8")
+        self.send_response(server.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class WeatherServiceTest(unittest.TestCase):
+    def setUp(self):
+        today = datetime.now().date()
+        self.tomorrow = today + timedelta(days=1)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.lock = threading.Lock()
+        self.server.gets = []
+        self.server.delay = 0.2
+        self.server.status = 200
+        self.server.payloads = {
+            "weather": {
+                "main": {"temp": 71.6, "feels_like": 70.2, "humidity": 40},
+                "weather": [{"description": "few clouds"}],
+                "wind": {"speed": 5.5}
+            },
+            "forecast": {"list": [
+                forecast_entry(self.tomorrow, 0, 50.0),
+                forecast_entry(self.tomorrow, 12, 64.0, "light rain"),
+                forecast_entry(self.tomorrow, 18, 58.0),
+                forecast_entry(self.tomorrow + timedelta(days=1), 9, 45.0)
+            ]}
+        }
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        host, port = self.server.server_address
+        self.service = WeatherService("test-key", "Testville,IN,US", base_url=f"http://{host}:{port}")
+
+    def tearDown(self):
+        self.service.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def request_all(self, date_strs):
+        """Call request() for each date and wait for every callback"""
+        results = []
+        done = threading.Semaphore(0)
+
+        def callback(text):
+            results.append(text)
+            done.release()
+
+        for date_str in date_strs:
+            self.service.request(date_str, callback)
+        for _ in date_strs:
+            self.assertTrue(done.acquire(timeout=5), "weather callback never arrived")
+        return results
+
+    def test_rapid_requests_share_one_download(self):
+        results = self.request_all([self.tomorrow.strftime("%m/%d/%y")] * 5)
+        self.assertEqual(self.server.gets, ["forecast"])
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all("High: 64°F / Low: 50°F" in text for text in results))
+
+    def test_cache_hit_does_not_download(self):
+        date_str = self.tomorrow.strftime("%m/%d/%y")
+        self.request_all([date_str])
+        self.request_all([date_str, (self.tomorrow + timedelta(days=1)).strftime("%m/%d/%y")])
+        self.assertEqual(self.server.gets, ["forecast"])
+
+    def test_current_weather(self):
+        text = self.request_all([datetime.now().strftime("%m/%d/%y")])[0]
+        self.assertEqual(self.server.gets, ["weather"])
+        self.assertIn("72°F (feels like 70°F)", text)
+        self.assertIn("Few clouds", text)
+
+    def test_error_status(self):
+        self.server.status = 401
+        text = self.request_all([self.tomorrow.strftime("%m/%d/%y")])[0]
+        self.assertEqual(text, "Could not fetch forecast\n(Error: 401)")
+        # Failures aren't cached
+        self.server.status = 200
+        self.request_all([self.tomorrow.strftime("%m/%d/%y")])
+        self.assertEqual(self.server.gets, ["forecast", "forecast"])
+
+    def test_no_api_key(self):
+        service = WeatherService(None, "Testville,IN,US", base_url="http://127.0.0.1:9")
+        self.assertIn("Weather API key not configured", service.describe("1/1/26"))
+        service.close()
+
+
+class ParseForecastTest(unittest.TestCase):
+    def test_one_summary_per_day(self):
+        day = date(2026, 1, 10)
+        summaries = parse_forecast({"list": [
+            forecast_entry(day, 6, 40.0),
+            forecast_entry(day, 9, 45.0),
+            forecast_entry(day, 12, 55.0, "overcast clouds"),
+            forecast_entry(day, 15, 60.0),
+            forecast_entry(day + timedelta(days=1), 3, 35.0, "snow"),
+            forecast_entry(day + timedelta(days=1), 6, 37.0)
+        ]})
+        self.assertEqual(sorted(summaries), ["2026-01-10", "2026-01-11"])
+
+        first = summaries["2026-01-10"]
+        self.assertEqual((first["temp_min"], first["temp_max"]), (40.0, 60.0))
+        self.assertEqual(first["temp"], 55.0)  # The midday reading
+        self.assertEqual(first["description"], "overcast clouds")
+
+        second = summaries["2026-01-11"]
+        self.assertEqual(second["temp"], 35.0)  # No midday reading; falls back to the first
+        self.assertEqual(second["description"], "snow")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+"""
+Weather lookups for the Life Wellness Calendar.
+One pooled HTTP session, a TTL cache per location (the 5-day /forecast payload
+is parsed once into per-day summaries), and background fetching with request
+coalescing so clicking through several days only downloads the forecast once.
+requests is imported when the first download starts (on a worker thread), so
+it doesn't slow down app startup.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+BASE_URL = "https://api.openweathermap.org/data/2.5"
+
+
+class WeatherHTTPError(Exception):
+    """Non-200 reply from OpenWeather"""
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def parse_current(data):
+    """Summarize a /weather response"""
+    return {
+        "temp": data['main']['temp'],
+        "feels_like": data['main']['feels_like'],
+        "description": data['weather'][0]['description'],
+        "humidity": data['main']['humidity'],
+        "wind_speed": data['wind']['speed']
+    }
+
+
+def parse_forecast(data):
+    """Split a /forecast response into one summary per day, keyed by YYYY-MM-DD"""
+    by_day = {}
+    for f in data['list']:
+        by_day.setdefault(f['dt_txt'][:10], []).append(f)
+
+    summaries = {}
+    for day, forecasts in by_day.items():
+        # Use the midday forecast (around noon) if available, else the first one
+        forecast = forecasts[0]
+        for f in forecasts:
+            hour = int(f['dt_txt'].split()[1].split(':')[0])
+            if 11 <= hour <= 14:  # Between 11 AM and 2 PM
+                forecast = f
+                break
+
+        temps = [f['main']['temp'] for f in forecasts]
+        summary = parse_current(forecast)
+        summary["temp_max"] = max(temps)
+        summary["temp_min"] = min(temps)
+        summaries[day] = summary
+    return summaries
+
+
+class WeatherService:
+    def __init__(self, api_key, location, base_url=BASE_URL, ttl=600, timeout=5,
+                 session=None, deliver=None):
+        self.api_key = api_key
+        self.location = location
+        self.base_url = base_url
+        self.ttl = ttl
+        self.timeout = timeout
+        self._session = session  # Created on first download
+        # deliver(callback, text) hands a result back to the UI thread
+        self.deliver = deliver or (lambda callback, text: callback(text))
+
+        self._cache = {}      # (kind, location) -> (fetched_at, parsed)
+        self._inflight = {}   # (kind, location) -> [(date_obj, callback), ...]
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="weather")
+
+    @property
+    def session(self):
+        with self._lock:
+            if self._session is None:
+                self._session = self._make_session()
+            return self._session
+
+    @staticmethod
+    def _make_session():
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        return session
+
+    # ---- Public API ----
+
+    def describe(self, date_str):
+        """Blocking lookup; returns the text for the weather panel"""
+        date_obj, kind, message = self._plan(date_str)
+        if message:
+            return message
+        cached = self._cached(kind)
+        if cached is not None:
+            return self._format(kind, cached, date_obj)
+        try:
+            return self._format(kind, self._fetch(kind), date_obj)
+        except Exception as e:
+            return self._error_text(kind, e)
+
+    def request(self, date_str, callback):
+        """Non-blocking lookup; callback(text) is delivered through self.deliver"""
+        date_obj, kind, message = self._plan(date_str)
+        if message:
+            callback(message)
+            return
+        cached = self._cached(kind)
+        if cached is not None:
+            callback(self._format(kind, cached, date_obj))
+            return
+
+        key = (kind, self.location)
+        with self._lock:
+            waiters = self._inflight.get(key)
+            if waiters is not None:
+                # A download for this payload is already running; just wait for it
+                waiters.append((date_obj, callback))
+                return
+            self._inflight[key] = [(date_obj, callback)]
+        self._executor.submit(self._fetch_for_waiters, kind, key)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._session is not None:
+            self._session.close()
+
+    # ---- Fetching ----
+
+    def _plan(self, date_str):
+        """Work out which endpoint a date needs, or the message to show instead"""
+        if not self.api_key:
+            return None, None, "Weather API key not configured.\nAdd OPENWEATHER_API_KEY to .env file."
+        try:
+            date_obj = datetime.strptime(date_str, "%m/%d/%y").date()
+        except ValueError as e:
+            return None, None, f"Error:\n{str(e)}"
+
+        days_diff = (date_obj - datetime.now().date()).days
+        if days_diff == 0:
+            return date_obj, "weather", None
+        elif 0 < days_diff <= 5:
+            return date_obj, "forecast", None
+        elif days_diff < 0:
+            return None, None, f"📅 {date_obj.strftime('%B %d, %Y')}\n\n⏮️ This date has passed.\nWeather data not available for past dates."
+        else:
+            return None, None, f"📅 {date_obj.strftime('%B %d, %Y')}\n\n🔮 Forecast only available\nfor the next 5 days.\n\n(This date is {days_diff} days away)"
+
+    def _cached(self, kind):
+        entry = self._cache.get((kind, self.location))
+        if entry and time.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def _fetch(self, kind):
+        response = self.session.get(
+            f"{self.base_url}/{kind}",
+            params={"q": self.location, "appid": self.api_key, "units": "imperial"},
+            timeout=self.timeout
+        )
+        if response.status_code != 200:
+            raise WeatherHTTPError(response.status_code)
+        data = response.json()
+        parsed = parse_current(data) if kind == "weather" else parse_forecast(data)
+        self._cache[(kind, self.location)] = (time.monotonic(), parsed)
+        return parsed
+
+    def _fetch_for_waiters(self, kind, key):
+        try:
+            parsed = self._fetch(kind)
+            error = None
+        except Exception as e:
+            parsed, error = None, e
+
+        with self._lock:
+            waiters = self._inflight.pop(key, [])
+        for date_obj, callback in waiters:
+            if error is None:
+                text = self._format(kind, parsed, date_obj)
+            else:
+                text = self._error_text(kind, error)
+            self.deliver(callback, text)
+
+    # ---- Formatting ----
+
+    def _format(self, kind, parsed, date_obj):
+        if kind == "weather":
+            weather_text = f"📍 {self.location}\n"
+            weather_text += f"📅 {date_obj.strftime('%B %d, %Y')} (Today)\n\n"
+            weather_text += f"🌡️ {parsed['temp']:.0f}°F (feels like {parsed['feels_like']:.0f}°F)\n"
+            weather_text += f"☁️ {parsed['description'].capitalize()}\n"
+            weather_text += f"💧 Humidity: {parsed['humidity']}%\n"
+            weather_text += f"💨 Wind: {parsed['wind_speed']:.1f} mph"
+            return weather_text
+
+        day = parsed.get(date_obj.strftime("%Y-%m-%d"))
+        if day is None:
+            return f"No forecast available for\n{date_obj.strftime('%B %d, %Y')}"
+
+        days_diff = (date_obj - datetime.now().date()).days
+        weather_text = f"📍 {self.location}\n"
+        weather_text += f"📅 {date_obj.strftime('%B %d, %Y')}\n"
+        weather_text += f"({days_diff} day{'s' if days_diff > 1 else ''} from now)\n\n"
+        weather_text += f"🌡️ High: {day['temp_max']:.0f}°F / Low: {day['temp_min']:.0f}°F\n"
+        weather_text += f"   Around noon: {day['temp']:.0f}°F (feels like {day['feels_like']:.0f}°F)\n"
+        weather_text += f"☁️ {day['description'].capitalize()}\n"
+        weather_text += f"💧 Humidity: {day['humidity']}%\n"
+        weather_text += f"💨 Wind: {day['wind_speed']:.1f} mph"
+        return weather_text
+
+    @staticmethod
+    def _error_text(kind, error):
+        import requests  # Already loaded by the download that failed
+
+        if isinstance(error, WeatherHTTPError):
+            what = "weather" if kind == "weather" else "forecast"
+            return f"Could not fetch {what}\n(Error: {error.status_code})"
+        if isinstance(error, requests.exceptions.RequestException):
+            return f"Network error:\n{str(error)}"
+        return f"Error:\n{str(error)}"